@@ -9,11 +9,9 @@ from . import simulator
 from . import config
 
 from .testbed import *
-from .simulator import *
 from .config import *
 
 from .version import get_version
-__version__ = get_version()
 
 __all__ = []
 __all__.extend(testbed.__all__)
@@ -24,3 +22,14 @@ os.environ['FOR_DISABLE_CONSOLE_CTRL_HANDLER'] = '1'
 
 # Enable printing of stacktrace upon segfault.
 faulthandler.enable()
+
+def __getattr__(name):
+    # Looking up the version imports pkg_resources, which is slow.
+    if name == '__version__':
+        return get_version()
+
+    # The simulator imports heavy dependencies, so only import it on first use.
+    if name in simulator.__all__:
+        return getattr(simulator, name)
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
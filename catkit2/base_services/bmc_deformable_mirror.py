@@ -1,7 +1,6 @@
 from catkit2.base_services.deformable_mirror import DeformableMirrorService
 
 import numpy as np
-from astropy.io import fits
 
 
 class BmcDeformableMirror(DeformableMirrorService):
@@ -20,6 +19,9 @@ class BmcDeformableMirror(DeformableMirrorService):
         self._discretized_surface = None
 
     def open(self):
+        # The import is here instead of at the top of the file to reduce import time.
+        from astropy.io import fits
+
         with fits.open(self.flat_map_fname) as f:
             self.flat_map = f['COMMAND'].data.astype('float64')
 
@@ -2,7 +2,6 @@ from ..testbed.service import Service
 
 import threading
 import numpy as np
-from astropy.io import fits
 
 
 class DeformableMirrorService(Service):
@@ -13,6 +12,9 @@ class DeformableMirrorService(Service):
         fname = self.config.get('device_actuator_mask_fname', None)
 
         if fname is not None:
+            # The import is here instead of at the top of the file to reduce import time.
+            from astropy.io import fits
+
             self.device_actuator_mask = fits.getdata(fname).astype('bool')
             if self.device_actuator_mask.ndim <= 1:
                 raise ValueError(f'The provided device actuator mask needs for {self.service_id} to be at least a 2D array.')
@@ -61,6 +63,8 @@ class DeformableMirrorService(Service):
 
         # Get the right default flat map.
         if channel_name in self.startup_maps:
+            from astropy.io import fits
+
             with fits.open(self.startup_maps[channel_name]) as f:
                 startup_map_command = f['COMMAND'].data.astype('float64')
         else:
@@ -65,3 +65,46 @@ def read_config_files(config_files):
         config = _deep_update(config, _read_config_file(config_file))
 
     return config
+
+def get_config_subtree(config, path):
+    '''Get part of a configuration.
+
+    Parameters
+    ----------
+    config : dict
+        The full configuration.
+    path : string
+        A JSON pointer to the requested part of the configuration,
+        for example "/services/camera". An empty string refers to
+        the whole configuration.
+
+    Returns
+    -------
+    The part of the configuration at `path`.
+
+    Raises
+    ------
+    KeyError
+        If the path does not exist in the configuration.
+    '''
+    if not path:
+        return config
+
+    if not path.startswith('/'):
+        raise KeyError(f'Config path "{path}" should start with a "/".')
+
+    res = config
+
+    for token in path[1:].split('/'):
+        # Unescape according to the JSON pointer specification.
+        token = token.replace('~1', '/').replace('~0', '~')
+
+        try:
+            if isinstance(res, list):
+                res = res[int(token)]
+            else:
+                res = res[token]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise KeyError(f'Config path "{path}" does not exist.')
+
+    return res
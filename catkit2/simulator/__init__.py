@@ -6,6 +6,21 @@ __all__ = [
     'SimpleOpticalModel'
 ]
 
-from .optical_model import *
-from .simulator import *
-from .simple_optical_model import *
+import importlib
+
+# Submodules import heavy dependencies, such as hcipy, so only import them on first use.
+_submodules = {
+    'OpticalModel': 'optical_model',
+    'property_with_logic': 'optical_model',
+    'with_cached_result': 'optical_model',
+    'Simulator': 'simulator',
+    'SimpleOpticalModel': 'simple_optical_model'
+}
+
+def __getattr__(name):
+    if name in _submodules:
+        module = importlib.import_module('.' + _submodules[name], __name__)
+
+        return getattr(module, name)
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
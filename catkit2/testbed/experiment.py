@@ -2,7 +2,6 @@ import logging
 import os
 import time
 import datetime
-import asdf
 import yaml
 
 from .logging import CatkitLogHandler, LogWriter, LogTerminal
@@ -52,6 +51,9 @@ class Experiment:
             os.makedirs(self.output_path, exist_ok=True)
 
             # Write out metadata to this output path.
+            # The import is here instead of at the top of the file to reduce import time.
+            import asdf
+
             af = asdf.AsdfFile(self.metadata)
             af.write_to(os.path.join(self.output_path, 'metadata.asdf'))
 
@@ -0,0 +1,322 @@
+import os
+import sys
+import json
+import runpy
+import signal
+import importlib
+import threading
+import traceback
+import subprocess
+
+from .monitoring import wait_for_process_exit
+
+
+class ForkedProcess:
+    '''A handle to a process that was launched by a fork server.
+
+    The process is not a child of this process, so its exit code is not available.
+
+    Parameters
+    ----------
+    pid : int
+        The process id of the process.
+    '''
+    def __init__(self, pid):
+        self.pid = pid
+        self.returncode = None
+
+    def wait(self, timeout=None):
+        '''Wait for the process to exit.
+
+        Parameters
+        ----------
+        timeout : float or None, optional
+            The maximum time to wait in seconds. If this is None (default), wait indefinitely.
+
+        Raises
+        ------
+        subprocess.TimeoutExpired
+            If the process did not exit within the timeout.
+        '''
+        if not wait_for_process_exit(self.pid, timeout):
+            raise subprocess.TimeoutExpired(str(self.pid), timeout)
+
+
+class ForkServer:
+    '''A warm Python interpreter that launches Python services by forking itself.
+
+    Starting a Python service from scratch requires importing numpy, catkit2 and
+    its dependencies, which can take multiple seconds. The fork server does
+    these imports once, and forks itself for each service. The forked process
+    then applies the environment, working directory, CPU affinity and priority
+    of the service, and runs the service script.
+
+    Environment variables that are read during the import of preloaded modules
+    have no effect on forked services. Services that rely on those should not
+    use the fork server.
+
+    This is only available on platforms that support fork().
+
+    Parameters
+    ----------
+    preload : list of strings or None
+        The names of additional modules to import in the fork server. The catkit2
+        package is always imported.
+    '''
+    def __init__(self, preload=None):
+        if preload is None:
+            preload = []
+
+        self.preload = preload
+        self.process = None
+
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_supported():
+        '''Whether fork servers are supported on this platform.
+
+        Returns
+        -------
+        boolean
+            Whether fork servers are supported.
+        '''
+        return hasattr(os, 'fork')
+
+    def start(self):
+        '''Start the fork server.
+
+        This waits until all modules have been preloaded.
+
+        Raises
+        ------
+        RuntimeError
+            If the fork server could not be started.
+        '''
+        self.process = subprocess.Popen(
+            [sys.executable, '-c', 'import sys; from catkit2.testbed.forkserver import main; main(sys.argv[1:])'] + self.preload,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True)
+
+        reply = self.process.stdout.readline()
+
+        if not reply:
+            self.process.wait()
+            self.process = None
+
+            raise RuntimeError('The fork server exited during startup.')
+
+    def stop(self):
+        '''Stop the fork server.
+
+        Services that were launched by the fork server keep running.
+        '''
+        if self.process is None:
+            return
+
+        # The fork server exits when its input is closed.
+        self.process.stdin.close()
+        self.process.wait()
+        self.process.stdout.close()
+
+        self.process = None
+
+    def launch(self, executable, args, cwd, env, cpu_affinity=None, nice=None):
+        '''Launch a Python script in a forked process.
+
+        Parameters
+        ----------
+        executable : string
+            The path to the Python script to run.
+        args : list of strings
+            The command line arguments for the script.
+        cwd : string
+            The working directory for the script.
+        env : dictionary
+            The environment variables for the script.
+        cpu_affinity : list of ints or None
+            The CPU cores to run the script on. If this is None, the CPU affinity is not changed.
+        nice : int or None
+            The nice value of the process. If this is None, the nice value is not changed.
+
+        Returns
+        -------
+        ForkedProcess
+            A handle to the launched process.
+
+        Raises
+        ------
+        RuntimeError
+            If the fork server is not running or if the process could not be launched.
+        '''
+        request = {
+            'executable': executable,
+            'args': args,
+            'cwd': cwd,
+            'env': env,
+            'cpu_affinity': cpu_affinity,
+            'nice': nice
+        }
+
+        with self._lock:
+            if self.process is None:
+                raise RuntimeError('The fork server is not running.')
+
+            self.process.stdin.write(json.dumps(request).encode('utf-8') + b'\n')
+            self.process.stdin.flush()
+
+            reply = self.process.stdout.readline()
+
+        if not reply:
+            raise RuntimeError('The fork server has exited.')
+
+        reply = json.loads(reply)
+
+        if 'error' in reply:
+            raise RuntimeError(f'The fork server could not launch the process: {reply["error"]}')
+
+        return ForkedProcess(reply['pid'])
+
+
+def _reap_children(signum, frame):
+    try:
+        while True:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+
+            if pid == 0:
+                break
+    except ChildProcessError:
+        # No more children.
+        pass
+
+
+def _run_child(request, status_write, fds_to_close):
+    exit_code = 1
+
+    try:
+        os.setsid()
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+
+        for fd in fds_to_close:
+            os.close(fd)
+
+        try:
+            if request['cpu_affinity'] is not None:
+                os.sched_setaffinity(0, request['cpu_affinity'])
+
+            if request['nice'] is not None:
+                os.setpriority(os.PRIO_PROCESS, 0, request['nice'])
+
+            os.chdir(request['cwd'])
+
+            os.environ.clear()
+            os.environ.update(request['env'])
+        except Exception as e:
+            os.write(status_write, str(e).encode('utf-8'))
+            raise
+        finally:
+            # Signal the fork server that the process was set up.
+            os.close(status_write)
+
+        sys.argv = [request['executable']] + request['args']
+        sys.path[0] = os.path.dirname(request['executable'])
+
+        runpy.run_path(request['executable'], run_name='__main__')
+
+        exit_code = 0
+    except SystemExit as e:
+        if e.code is None:
+            exit_code = 0
+        elif isinstance(e.code, int):
+            exit_code = e.code
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(exit_code)
+
+
+def _fork(request, fds_to_close):
+    status_read, status_write = os.pipe()
+
+    pid = os.fork()
+
+    if pid == 0:
+        os.close(status_read)
+        _run_child(request, status_write, fds_to_close)
+
+    os.close(status_write)
+
+    # Wait until the child has applied its settings.
+    error = b''
+    while True:
+        data = os.read(status_read, 4096)
+
+        if not data:
+            break
+
+        error += data
+
+    os.close(status_read)
+
+    if error:
+        raise RuntimeError(error.decode('utf-8'))
+
+    return pid
+
+
+def main(preload):
+    '''Run a fork server.
+
+    Requests are read as JSON lines from stdin, and replies are written as
+    JSON lines to stdout. The server exits when stdin is closed.
+
+    Parameters
+    ----------
+    preload : list of strings
+        The names of the modules to import before forking.
+    '''
+    # Keep stdin and stdout for requests and replies, and make sure that
+    # nothing else can write to them.
+    request_fd = os.dup(0)
+    reply_fd = os.dup(1)
+
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+    os.close(devnull)
+
+    requests = os.fdopen(request_fd, 'rb')
+    replies = os.fdopen(reply_fd, 'wb')
+
+    for module in preload:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            traceback.print_exc()
+
+    signal.signal(signal.SIGCHLD, _reap_children)
+
+    replies.write(json.dumps({'ready': True}).encode('utf-8') + b'\n')
+    replies.flush()
+
+    while True:
+        line = requests.readline()
+
+        if not line:
+            break
+
+        try:
+            request = json.loads(line)
+
+            reply = {'pid': _fork(request, [request_fd, reply_fd])}
+        except Exception as e:
+            reply = {'error': str(e)}
+
+        replies.write(json.dumps(reply).encode('utf-8') + b'\n')
+        replies.flush()
@@ -28,7 +28,7 @@ class CatkitLogHandler(logging.StreamHandler):
 
 class LogObserver:
     def __init__(self, host, port):
-        self.context = zmq.Context()
+        self.context = zmq.Context.instance()
         self.host = host
         self.port = port
 
@@ -0,0 +1,376 @@
+import os
+import time
+import heapq
+import select
+import threading
+import traceback
+
+import psutil
+
+# The quantities in a resource usage sample, in order.
+RESOURCE_FIELDS = ('cpu_percent', 'memory_rss', 'num_threads', 'num_fds', 'shared_memory_bytes')
+
+
+def wait_for_process_exit(process_id, timeout=None):
+    '''Wait for a process to exit.
+
+    On Linux, this waits on a process file descriptor, so that the exit is noticed
+    immediately without polling. Elsewhere, this falls back to psutil.
+
+    Parameters
+    ----------
+    process_id : int
+        The process id of the process to wait for.
+    timeout : float or None, optional
+        The maximum time to wait in seconds. If this is None (default), wait indefinitely.
+
+    Returns
+    -------
+    boolean
+        Whether the process has exited.
+    '''
+    if hasattr(os, 'pidfd_open'):
+        try:
+            fd = os.pidfd_open(process_id)
+        except ProcessLookupError:
+            return True
+        except OSError:
+            # Process file descriptors are not supported by this kernel.
+            pass
+        else:
+            try:
+                poller = select.poll()
+                poller.register(fd, select.POLLIN)
+
+                # The file descriptor becomes readable when the process exits.
+                return bool(poller.poll(None if timeout is None else timeout * 1000))
+            finally:
+                os.close(fd)
+
+    try:
+        psutil.Process(process_id).wait(timeout)
+    except psutil.NoSuchProcess:
+        pass
+    except psutil.TimeoutExpired:
+        return False
+
+    return True
+
+
+def get_shared_memory_size(service_id, process_ids):
+    '''Get the total size of the data streams owned by a service.
+
+    Shared memory for data streams is named after the process and service that
+    created it. This is only supported on Linux, where the shared memory is visible
+    in /dev/shm.
+
+    Parameters
+    ----------
+    service_id : string
+        The identifier of the service.
+    process_ids : list of ints
+        The process ids of the processes of this service that could own data streams.
+
+    Returns
+    -------
+    int or None
+        The total size of the data streams in bytes, or None if this is not supported
+        on this platform.
+    '''
+    if not os.path.isdir('/dev/shm'):
+        return None
+
+    prefixes = tuple(f'{pid}.{service_id}.' for pid in process_ids)
+
+    if not prefixes:
+        return 0
+
+    total = 0
+
+    with os.scandir('/dev/shm') as entries:
+        for entry in entries:
+            if entry.name.startswith(prefixes):
+                try:
+                    total += entry.stat().st_size
+                except FileNotFoundError:
+                    # The data stream was removed in the meantime.
+                    pass
+
+    return total
+
+
+def sample_resource_usage(process, service_id, process_ids):
+    '''Sample the resource usage of a service process.
+
+    The CPU usage is measured since the previous call for the same process object,
+    so the same object should be passed in for consecutive samples.
+
+    Parameters
+    ----------
+    process : psutil.Process
+        The process of the service.
+    service_id : string
+        The identifier of the service.
+    process_ids : list of ints
+        The process ids of the processes of this service that could own data streams.
+
+    Returns
+    -------
+    list of floats
+        The resource usage, in the order of `RESOURCE_FIELDS`. Quantities that are not
+        available on this platform are NaN.
+    '''
+    with process.oneshot():
+        cpu_percent = process.cpu_percent()
+        memory_rss = process.memory_info().rss
+        num_threads = process.num_threads()
+
+        if hasattr(process, 'num_fds'):
+            num_fds = process.num_fds()
+        else:
+            num_fds = process.num_handles()
+
+    shared_memory_bytes = get_shared_memory_size(service_id, process_ids)
+
+    if shared_memory_bytes is None:
+        shared_memory_bytes = float('nan')
+
+    return [cpu_percent, memory_rss, num_threads, num_fds, shared_memory_bytes]
+
+
+class ProcessWatcher:
+    '''Calls a callback when a watched process exits.
+
+    On Linux, a single thread waits on process file descriptors for all watched
+    processes at once. On other platforms, each process gets its own thread that
+    waits for the process to exit. In both cases, exits are noticed immediately,
+    without any polling.
+
+    The exited process is reaped before the callback is called.
+
+    Parameters
+    ----------
+    callback : function
+        A callback to call with each process that exited.
+    '''
+    def __init__(self, callback):
+        self.callback = callback
+
+        self.use_pidfd = hasattr(os, 'pidfd_open')
+
+        self.shutdown_flag = threading.Event()
+        self.thread = None
+
+        self._lock = threading.Lock()
+        self._new_processes = []
+        self._wakeup_read = None
+        self._wakeup_write = None
+
+    def start(self):
+        '''Start watching processes.
+        '''
+        self.shutdown_flag.clear()
+
+        if self.use_pidfd:
+            self._wakeup_read, self._wakeup_write = os.pipe()
+
+            self.thread = threading.Thread(target=self._watch_pidfds)
+            self.thread.start()
+
+    def stop(self):
+        '''Stop watching processes.
+
+        This function waits until the watcher thread is actually stopped.
+        '''
+        self.shutdown_flag.set()
+
+        if self.thread:
+            self._wake_up()
+
+            self.thread.join()
+            self.thread = None
+
+            os.close(self._wakeup_read)
+            os.close(self._wakeup_write)
+
+    def watch(self, process):
+        '''Start watching a process.
+
+        Parameters
+        ----------
+        process : subprocess.Popen
+            The process to watch.
+        '''
+        if self.use_pidfd:
+            with self._lock:
+                self._new_processes.append(process)
+
+            self._wake_up()
+        else:
+            thread = threading.Thread(target=self._wait_for_process, args=(process,), daemon=True)
+            thread.start()
+
+    def _wake_up(self):
+        os.write(self._wakeup_write, b'\0')
+
+    def _handle_exit(self, process):
+        try:
+            # Reap the process to avoid zombies.
+            process.wait()
+
+            if not self.shutdown_flag.is_set():
+                self.callback(process)
+        except Exception:
+            print(traceback.format_exc())
+
+    def _wait_for_process(self, process):
+        self._handle_exit(process)
+
+    def _watch_pidfds(self):
+        poller = select.poll()
+        poller.register(self._wakeup_read, select.POLLIN)
+
+        processes = {}
+
+        try:
+            while not self.shutdown_flag.is_set():
+                for fd, event in poller.poll():
+                    if fd == self._wakeup_read:
+                        os.read(self._wakeup_read, 4096)
+
+                        with self._lock:
+                            new_processes = self._new_processes
+                            self._new_processes = []
+
+                        for process in new_processes:
+                            try:
+                                pidfd = os.pidfd_open(process.pid)
+                            except OSError:
+                                # The process was already reaped.
+                                self._handle_exit(process)
+                                continue
+
+                            processes[pidfd] = process
+                            poller.register(pidfd, select.POLLIN)
+                    else:
+                        # The pidfd becomes readable when the process exits.
+                        process = processes.pop(fd)
+
+                        poller.unregister(fd)
+                        os.close(fd)
+
+                        self._handle_exit(process)
+        finally:
+            for pidfd in processes.keys():
+                os.close(pidfd)
+
+
+class Watchdog:
+    '''Calls check functions at scheduled times.
+
+    All checks are run on a single thread, which sleeps until the next check is due.
+
+    Each check is called with its key and should return the delay in seconds until it
+    should be called again, or None if it should not be called again.
+    '''
+    def __init__(self):
+        self.shutdown_flag = threading.Event()
+        self.thread = None
+
+        self._condition = threading.Condition()
+        self._queue = []
+        self._deadlines = {}
+
+    def start(self):
+        '''Start the watchdog thread.
+        '''
+        self.shutdown_flag.clear()
+
+        self.thread = threading.Thread(target=self._run)
+        self.thread.start()
+
+    def stop(self):
+        '''Stop the watchdog thread.
+
+        This function waits until the thread is actually stopped.
+        '''
+        with self._condition:
+            self.shutdown_flag.set()
+            self._condition.notify()
+
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+    def schedule(self, key, delay, check):
+        '''Schedule a check.
+
+        This replaces any previously-scheduled check with the same key.
+
+        Parameters
+        ----------
+        key : hashable
+            The key for this check.
+        delay : float
+            The time in seconds until the check should be called.
+        check : function
+            The check function.
+        '''
+        with self._condition:
+            deadline = time.monotonic() + delay
+
+            self._deadlines[key] = deadline
+            heapq.heappush(self._queue, (deadline, id(check), key, check))
+
+            self._condition.notify()
+
+    def cancel(self, key):
+        '''Cancel a scheduled check.
+
+        Parameters
+        ----------
+        key : hashable
+            The key of the check to cancel.
+        '''
+        with self._condition:
+            self._deadlines.pop(key, None)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self.shutdown_flag.is_set():
+                    if self._queue:
+                        timeout = self._queue[0][0] - time.monotonic()
+
+                        if timeout <= 0:
+                            break
+                    else:
+                        timeout = None
+
+                    self._condition.wait(timeout)
+
+                if self.shutdown_flag.is_set():
+                    return
+
+                deadline, _, key, check = heapq.heappop(self._queue)
+
+                # Skip checks that were cancelled or rescheduled.
+                if self._deadlines.get(key) != deadline:
+                    continue
+
+                del self._deadlines[key]
+
+            try:
+                delay = check(key)
+            except Exception:
+                print(traceback.format_exc())
+                delay = None
+
+            if delay is not None:
+                with self._condition:
+                    # Do not override a check that was scheduled while this one was running.
+                    if key not in self._deadlines:
+                        deadline = time.monotonic() + delay
+
+                        self._deadlines[key] = deadline
+                        heapq.heappush(self._queue, (deadline, id(check), key, check))
@@ -13,15 +13,28 @@ __all__ = [
     'OceanopticsSpectroProxy'
 ]
 
-from .bmc_dm import *
-from .camera import *
-from .deformable_mirror import *
-from .newport_xps import *
-from .flip_mount import *
-from .newport_picomotor import *
-from .ni_daq import *
-from .nkt_superk import *
-from .oceanoptics_spectrometer import *
-from .thorlabs_cube_motor_kinesis import *
-from .thorlabs_mcls1 import *
-from .web_power_switch import *
+import importlib
+
+# The proxy modules import heavy dependencies, so only import them on first use.
+_proxy_modules = {
+    'BmcDmProxy': 'bmc_dm',
+    'CameraProxy': 'camera',
+    'DeformableMirrorProxy': 'deformable_mirror',
+    'NewportXpsQ8Proxy': 'newport_xps',
+    'FlipMountProxy': 'flip_mount',
+    'NewportPicomotorProxy': 'newport_picomotor',
+    'NiDaqProxy': 'ni_daq',
+    'NktSuperkProxy': 'nkt_superk',
+    'OceanopticsSpectroProxy': 'oceanoptics_spectrometer',
+    'ThorlabsCubeMotorKinesisProxy': 'thorlabs_cube_motor_kinesis',
+    'ThorlabsMcls1': 'thorlabs_mcls1',
+    'WebPowerSwitchProxy': 'web_power_switch'
+}
+
+def __getattr__(name):
+    if name in _proxy_modules:
+        module = importlib.import_module('.' + _proxy_modules[name], __name__)
+
+        return getattr(module, name)
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -1,3 +1,5 @@
+import importlib
+
 from .. import catkit_bindings
 
 class ServiceProxy(catkit_bindings.ServiceProxy):
@@ -12,6 +14,22 @@ class ServiceProxy(catkit_bindings.ServiceProxy):
     '''
     _service_interfaces = {}
 
+    # Modules that define service interfaces. These are only imported when their interface is first requested.
+    _service_interface_modules = {
+        'bmc_dm': 'catkit2.testbed.proxies.bmc_dm',
+        'camera': 'catkit2.testbed.proxies.camera',
+        'deformable_mirror': 'catkit2.testbed.proxies.deformable_mirror',
+        'flip_mount': 'catkit2.testbed.proxies.flip_mount',
+        'newport_picomotor': 'catkit2.testbed.proxies.newport_picomotor',
+        'newport_xps_q8': 'catkit2.testbed.proxies.newport_xps',
+        'ni_daq': 'catkit2.testbed.proxies.ni_daq',
+        'nkt_superk': 'catkit2.testbed.proxies.nkt_superk',
+        'oceanoptics_spectrometer': 'catkit2.testbed.proxies.oceanoptics_spectrometer',
+        'thorlabs_cube_motor_kinesis': 'catkit2.testbed.proxies.thorlabs_cube_motor_kinesis',
+        'thorlabs_mcls1': 'catkit2.testbed.proxies.thorlabs_mcls1',
+        'web_power_switch': 'catkit2.testbed.proxies.web_power_switch',
+    }
+
     def __init__(self, testbed, service_id):
         super().__init__(testbed, service_id)
 
@@ -86,7 +104,9 @@ class ServiceProxy(catkit_bindings.ServiceProxy):
     def get_service_interface(cls, interface_name):
         '''Get the service proxy class belonging to an interface name.
 
-        If no interface is defined, return a default ServiceProxy class.
+        If no interface is defined, return a default ServiceProxy class. If the
+        interface was not registered yet, but its module is known, the module
+        is imported first.
 
         Parameters
         ----------
@@ -98,6 +118,10 @@ class ServiceProxy(catkit_bindings.ServiceProxy):
         derived class of ServiceProxy or ServiceProxy
             The class belonging to the interface name.
         '''
+        if interface_name not in cls._service_interfaces and interface_name in cls._service_interface_modules:
+            # Importing the module registers the interface.
+            importlib.import_module(cls._service_interface_modules[interface_name])
+
         if interface_name in cls._service_interfaces:
             return cls._service_interfaces[interface_name]
         elif interface_name is None:
@@ -125,3 +149,20 @@ class ServiceProxy(catkit_bindings.ServiceProxy):
             return interface_class
 
         return decorator
+
+    @classmethod
+    def register_service_interface_module(cls, interface_name, module_name):
+        '''Register the module that defines a service interface.
+
+        The module will only be imported when the interface is first requested. The
+        module should register its ServiceProxy derived class with
+        :func:`register_service_interface`.
+
+        Parameters
+        ----------
+        interface_name : string
+            The name of the interface.
+        module_name : string
+            The full name of the module, as used in an import statement.
+        '''
+        cls._service_interface_modules[interface_name] = module_name
@@ -1,10 +1,12 @@
 import sys
 import json
+import hashlib
 import os
 import time
 import subprocess
 import socket
 import threading
+import queue
 import contextlib
 
 import psutil
@@ -14,12 +16,18 @@ import numpy as np
 from ..catkit_bindings import LogForwarder, Server, ServiceState, DataStream, get_timestamp, is_alive_state, Client, get_host_name
 from .logging import *
 from .distributor import ZmqDistributor
+from .monitoring import ProcessWatcher, Watchdog, wait_for_process_exit, sample_resource_usage, RESOURCE_FIELDS
+from .forkserver import ForkServer
+from ..config import get_config_subtree
 
 from ..proto import testbed_pb2 as testbed_proto
 from ..proto import service_pb2 as service_proto
 
 
 SERVICE_LIVELINESS = 5
+SERVICE_STARTUP_TIMEOUT = 120
+SERVICE_RECOVERY_CHECK_INTERVAL = 1
+RESOURCE_SAMPLING_INTERVAL = 1
 
 
 if sys.platform == 'win32':
@@ -97,7 +105,19 @@ class ServiceReference:
         self.state_stream = DataStream.create('state', service_id, 'int8', [1], 20)
         self.state = state
 
+        # Resource usage samples of the service process. See RESOURCE_FIELDS for the contents.
+        self.resources_stream = DataStream.create('resources', service_id, 'float64', [len(RESOURCE_FIELDS)], 20)
+        self.resources_stream.submit_data(np.full(len(RESOURCE_FIELDS), np.nan))
+
         self.process_id = None
+        self._process = None
+
+        # The processes of this service that crashed since it was last closed cleanly,
+        # most recent first. A restarted service can reuse their data streams.
+        self.previous_process_ids = []
+
+        self.time_launched = None
+        self.restart_count = 0
 
         self.host = '127.0.0.1'
         self.port = 0
@@ -120,14 +140,28 @@ class ServiceReference:
 
     @property
     def process(self):
-        if self.process_id is None:
+        process_id = self.process_id
+
+        if process_id is None:
             return None
 
+        process = self._process
+
         try:
-            return psutil.Process(self.process_id)
+            # Reuse the process handle as long as the process id doesn't change.
+            if process is None or process.pid != process_id:
+                process = psutil.Process(process_id)
+                self._process = process
+
+            if process.is_running():
+                return process
         except psutil.NoSuchProcess:
-            self.process_id = None
-            return None
+            pass
+
+        self.process_id = None
+        self._process = None
+
+        return None
 
     def stop(self):
         if self.state != ServiceState.RUNNING:
@@ -141,6 +175,59 @@ class ServiceReference:
         except Exception as e:
             raise RuntimeError("Something went wrong while stopping service.") from e
 
+    def wait_for_exit(self, timeout=None, force_event=None):
+        '''Wait for the service to exit.
+
+        Parameters
+        ----------
+        timeout : float or None, optional
+            The maximum time to wait in seconds. If this is None (default), wait indefinitely.
+        force_event : threading.Event or None, optional
+            If this event gets set, stop waiting.
+
+        Returns
+        -------
+        boolean
+            Whether the service has exited.
+        '''
+        deadline = None if timeout is None else time.time() + timeout
+        state_stream = None
+
+        while True:
+            process_id = self.process_id
+
+            if process_id is None:
+                # Without a process, rely on the state that the service reports.
+                if not self.is_alive:
+                    return True
+            elif self.process is None:
+                return True
+
+            if force_event is not None and force_event.is_set():
+                return False
+
+            # Wait in short slices, to respond to the force event.
+            wait_time = 0.5
+
+            if deadline is not None:
+                wait_time = min(wait_time, deadline - time.time())
+
+                if wait_time <= 0:
+                    return False
+
+            if process_id is None:
+                if state_stream is None:
+                    # Use our own reader, to not interfere with other threads waiting on the same stream.
+                    state_stream = DataStream.open(self.state_stream.stream_id)
+
+                try:
+                    state_stream.get_next_frame(int(wait_time * 1000) + 1)
+                except RuntimeError:
+                    # No new state was submitted.
+                    pass
+            elif wait_for_process_exit(process_id, wait_time):
+                return True
+
     def interrupt(self):
         '''Send a keyboard interrupt to the service.
         '''
@@ -202,9 +289,21 @@ class Testbed:
         self.is_simulated = is_simulated
         self.config = config
 
+        # The config does not change during the lifetime of the testbed, so clients can cache it by its hash.
+        self.config_hash = hashlib.sha256(json.dumps(config, sort_keys=True).encode('utf-8')).hexdigest()
+
         self.services = {}
         self.launched_processes = []
 
+        self.launch_lock = threading.Lock()
+        self.startup_timeline = {}
+
+        self.process_watcher = ProcessWatcher(self.on_process_exit)
+        self.fork_server = None
+        self.watchdog = Watchdog()
+
+        self.resource_sampling_interval = self.config['testbed'].get('resource_sampling_interval', RESOURCE_SAMPLING_INTERVAL)
+
         self.log_distributor = None
         self.log_handler = None
         self.log_forwarder = None
@@ -278,12 +377,14 @@ class Testbed:
         self.server = Server(port)
 
         self.server.register_request_handler('start_service', self.on_start_service)
+        self.server.register_request_handler('start_services', self.on_start_services)
         self.server.register_request_handler('stop_service', self.on_stop_service)
         self.server.register_request_handler('interrupt_service', self.on_interrupt_service)
         self.server.register_request_handler('terminate_service', self.on_terminate_service)
         self.server.register_request_handler('get_info', self.on_get_info)
+        self.server.register_request_handler('get_config', self.on_get_config)
         self.server.register_request_handler('get_service_info', self.on_get_service_info)
-        self.server.register_request_handler('register_service', self.on_register_service)
+        self.server.register_request_handler('register_and_configure', self.on_register_and_configure)
         self.server.register_request_handler('shut_down', self.on_shut_down)
 
         self.is_running = False
@@ -300,10 +401,9 @@ class Testbed:
         self.shutdown_flag.clear()
 
         heartbeat_thread = None
-        monitor_services_thread = None
 
         try:
-            self.context = zmq.Context()
+            self.context = zmq.Context.instance()
 
             # Start the logging.
             self.start_log_distributor()
@@ -312,6 +412,10 @@ class Testbed:
             # Start tracing distributor.
             self.start_tracing_distributor()
 
+            # Start the fork server, if requested.
+            if self.config['testbed'].get('use_forkserver', False):
+                self.start_fork_server()
+
             heartbeat_thread = threading.Thread(target=self.do_heartbeats)
             heartbeat_thread.start()
 
@@ -319,15 +423,14 @@ class Testbed:
             self.server.start()
 
             # Start monitoring services.
-            monitor_services_thread = threading.Thread(target=self.monitor_services)
-            monitor_services_thread.start()
+            self.process_watcher.start()
+            self.watchdog.start()
 
             # Start the startup services.
-            for service_id in self.startup_services:
-                try:
-                    self.start_service(service_id)
-                except Exception as e:
-                    self.log.error(str(e))
+            try:
+                self.start_services(self.startup_services)
+            except Exception as e:
+                self.log.error(str(e))
 
             # For now, wait until Ctrl+C.
             # In the future, monitor services and update heartbeat stream.
@@ -348,8 +451,10 @@ class Testbed:
                 if heartbeat_thread:
                     heartbeat_thread.join()
 
-                if monitor_services_thread:
-                    monitor_services_thread.join()
+                self.watchdog.stop()
+                self.process_watcher.stop()
+
+                self.stop_fork_server()
 
                 # Submit zero heartbeat to signal a dead testbed.
                 self.heartbeat_stream.submit_data(np.zeros(1, dtype='uint64'))
@@ -373,44 +478,186 @@ class Testbed:
             heartbeat = np.array([get_timestamp()], dtype='uint64')
             self.heartbeat_stream.submit_data(heartbeat)
 
-    def monitor_services(self):
-        while not self.shutdown_flag.is_set():
-            time.sleep(0.1)
+    def on_process_exit(self, process):
+        '''Handle the exit of a launched process.
+
+        Parameters
+        ----------
+        process : subprocess.Popen
+            The process that exited.
+        '''
+        with self.launch_lock:
+            if process in self.launched_processes:
+                self.launched_processes.remove(process)
+
+        for service_id, service in self.services.items():
+            if service.process_id != process.pid:
+                continue
+
+            if service.state not in [ServiceState.CLOSED, ServiceState.CRASHED, ServiceState.FAIL_SAFE]:
+                # The process is not running anymore, but its state indicates it's alive:
+                # it has crashed.
+                self.log.error(f'Service "{service.service_id}" appears to have crashed.')
+                service.state = ServiceState.CRASHED
+
+            if service.state == ServiceState.CRASHED:
+                service.previous_process_ids.insert(0, process.pid)
+
+                self.schedule_restart(service_id)
+            else:
+                # The service closed down cleanly, so nothing can be reused anymore.
+                service.previous_process_ids = []
+                service.restart_count = 0
+
+    def schedule_restart(self, service_id):
+        '''Schedule the restart of a crashed service according to its restart policy.
+
+        Services are only restarted if they have a `restart_policy` in their config.
+        Consecutive restarts are delayed with an exponential backoff. The restart
+        policy can contain the following keys:
+
+        * `max_restarts`: the maximum number of consecutive restarts. Default: 5.
+        * `initial_delay`: the delay before the first restart in seconds. Default: 1.
+        * `max_delay`: the maximum delay before a restart in seconds. Default: 60.
+        * `reset_after`: the time in seconds that a service needs to have been running
+          for its crash to not count as consecutive anymore. Default: 600.
+
+        Parameters
+        ----------
+        service_id : string
+            The identifier of the service.
+        '''
+        policy = self.config['services'][service_id].get('restart_policy')
+
+        if not policy or self.shutdown_requested.is_set():
+            return
+
+        service = self.services[service_id]
+
+        max_restarts = policy.get('max_restarts', 5)
+        initial_delay = policy.get('initial_delay', 1)
+        max_delay = policy.get('max_delay', 60)
+        reset_after = policy.get('reset_after', 600)
+
+        if service.time_launched is not None and time.time() - service.time_launched > reset_after:
+            service.restart_count = 0
+
+        if service.restart_count >= max_restarts:
+            self.log.error(f'Service "{service_id}" crashed {service.restart_count + 1} times in a row. Giving up on restarting it.')
+            return
+
+        delay = min(initial_delay * 2**service.restart_count, max_delay)
+        service.restart_count += 1
+
+        self.log.warning(f'Restarting service "{service_id}" in {delay:.1f}s (attempt {service.restart_count} of {max_restarts}).')
+
+        self.watchdog.schedule(('restart', service_id), delay, self._restart_service)
+
+    def _restart_service(self, key):
+        _, service_id = key
+
+        if self.shutdown_requested.is_set():
+            return None
+
+        if self.services[service_id].state != ServiceState.CRASHED:
+            # The service was already started by someone else in the meantime.
+            return None
+
+        self.log.info(f'Restarting service "{service_id}".')
+
+        try:
+            self.start_services([service_id], wait=False)
+        except Exception as e:
+            self.log.error(f'Could not restart service "{service_id}": {str(e)}')
+
+        # Do not call this check again.
+        return None
+
+    def sample_resources(self, key):
+        '''Sample the resource usage of a service and submit it to its resources stream.
+
+        This is called by the watchdog, and reschedules itself while the service is alive.
+
+        Parameters
+        ----------
+        key : tuple
+            The key of this check, containing the identifier of the service.
+
+        Returns
+        -------
+        float or None
+            The time in seconds until the next sample, or None if the service
+            should not be sampled anymore.
+        '''
+        _, service_id = key
+        service = self.services[service_id]
+
+        if not service.is_alive:
+            # Registering the service again restarts the sampling.
+            return None
+
+        process = service.process
+
+        if process is None:
+            return None
+
+        try:
+            process_ids = [process.pid] + service.previous_process_ids
+            sample = sample_resource_usage(process, service_id, process_ids)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return None
+
+        service.resources_stream.submit_data(np.array(sample, dtype='float64'))
+
+        return self.resource_sampling_interval
+
+    def check_heartbeat(self, service_id):
+        '''Check the heartbeat of a service.
+
+        This is called by the watchdog, and reschedules itself for when the
+        current heartbeat of the service would become too old.
+
+        Parameters
+        ----------
+        service_id : string
+            The identifier of the service.
+
+        Returns
+        -------
+        float or None
+            The time in seconds until the next check, or None if the service
+            should not be checked anymore.
+        '''
+        service = self.services[service_id]
+        state = service.state
 
-            # Avoid zombie processes. Communicate with processes after they exit.
-            for process in self.launched_processes:
-                if process.poll() is not None:
-                    process.communicate()
-
-                    self.launched_processes.remove(process)
-
-            for service_id, service in self.services.items():
-                if service.state not in [ServiceState.CLOSED, ServiceState.CRASHED, ServiceState.FAIL_SAFE]:
-                    if service.process is None:
-                        # The process is not running anymore, but its state indicates it's alive:
-                        # it has crashed.
-                        self.log.error(f'Service "{service.service_id}" appears to have crashed.')
-                        service.state = ServiceState.CRASHED
-
-                if service.state == ServiceState.RUNNING:
-                    heartbeat_time = service.heartbeat.get()[0]
-                    time_stamp = get_timestamp()
-
-                    if time_stamp - heartbeat_time > SERVICE_LIVELINESS * 1e9:
-                        # Service didn't submit a heartbeat in a while but its process is still alive:
-                        # it is unresponsive.
-                        self.log.warning(f'Service "{service.service_id}" appears to be unresponsive.')
-                        service.state = ServiceState.UNRESPONSIVE
-
-                if service.state == ServiceState.UNRESPONSIVE:
-                    heartbeat_time = service.heartbeat.get()[0]
-                    time_stamp = get_timestamp()
-
-                    if time_stamp - heartbeat_time < SERVICE_LIVELINESS * 1e9:
-                        # The service state indicates it's unresponsive, but it just submitted a
-                        # heartbeat again: the service recovered.
-                        self.log.info(f'Service "{service.service_id}" appears to have recovered from being unresponsive.')
-                        service.state = ServiceState.RUNNING
+        if not is_alive_state(state):
+            # Registering the service again restarts the checks.
+            return None
+
+        if state not in [ServiceState.RUNNING, ServiceState.UNRESPONSIVE]:
+            return SERVICE_LIVELINESS
+
+        heartbeat_age = (get_timestamp() - int(service.heartbeat.get()[0])) / 1e9
+
+        if heartbeat_age > SERVICE_LIVELINESS:
+            if state == ServiceState.RUNNING:
+                # Service didn't submit a heartbeat in a while but its process is still alive:
+                # it is unresponsive.
+                self.log.warning(f'Service "{service.service_id}" appears to be unresponsive.')
+                service.state = ServiceState.UNRESPONSIVE
+
+            # Check again soon, to notice when the service recovers.
+            return SERVICE_RECOVERY_CHECK_INTERVAL
+
+        if state == ServiceState.UNRESPONSIVE:
+            # The service state indicates it's unresponsive, but it just submitted a
+            # heartbeat again: the service recovered.
+            self.log.info(f'Service "{service.service_id}" appears to have recovered from being unresponsive.')
+            service.state = ServiceState.RUNNING
+
+        # Check again when the current heartbeat would become too old.
+        return SERVICE_LIVELINESS - heartbeat_age
 
     def setup_logging(self):
         '''Set up all logging.
@@ -467,18 +714,63 @@ class Testbed:
             self.tracing_distributor.stop()
             self.tracing_distributor = None
 
+    def start_fork_server(self):
+        '''Start the fork server for launching Python services.
+
+        If fork servers are not supported on this platform or the fork server
+        could not be started, services are launched as usual.
+        '''
+        if not ForkServer.is_supported():
+            self.log.warning('The fork server is not supported on this platform. Launching services normally.')
+            return
+
+        preload = self.config['testbed'].get('forkserver_preload', [])
+
+        self.log.debug('Starting the fork server.')
+        start = time.time()
+
+        fork_server = ForkServer(preload)
+
+        try:
+            fork_server.start()
+        except Exception as e:
+            self.log.error(f'Could not start the fork server: {str(e)}. Launching services normally.')
+            return
+
+        self.fork_server = fork_server
+
+        self.log.info(f'Started the fork server in {time.time() - start:.2f}s.')
+
+    def stop_fork_server(self):
+        '''Stop the fork server.
+        '''
+        if self.fork_server:
+            self.fork_server.stop()
+            self.fork_server = None
+
     def on_start_service(self, data):
         request = testbed_proto.StartServiceRequest()
         request.ParseFromString(data)
 
         service_id = request.service_id
 
-        self.start_service(service_id)
+        # Do not block the server while the service is starting.
+        self.start_service(service_id, wait=False)
 
         reply = testbed_proto.StartServiceReply()
 
         return reply.SerializeToString()
 
+    def on_start_services(self, data):
+        request = testbed_proto.StartServicesRequest()
+        request.ParseFromString(data)
+
+        # Do not block the server while the services are starting.
+        self.start_services(list(request.service_ids), wait=False)
+
+        reply = testbed_proto.StartServicesReply()
+        return reply.SerializeToString()
+
     def on_stop_service(self, data):
         request = testbed_proto.StopServiceRequest()
         request.ParseFromString(data)
@@ -516,7 +808,7 @@ class Testbed:
         reply = testbed_proto.GetInfoReply()
 
         reply.port = self.port
-        reply.config = json.dumps(self.config)
+        reply.config_hash = self.config_hash
         reply.is_simulated = self.is_simulated
         reply.heartbeat_stream_id = self.heartbeat_stream.stream_id
         reply.logging_ingress_port = self.logging_ingress_port
@@ -528,6 +820,17 @@ class Testbed:
 
         return reply.SerializeToString()
 
+    def on_get_config(self, data):
+        request = testbed_proto.GetConfigRequest()
+        request.ParseFromString(data)
+
+        reply = testbed_proto.GetConfigReply()
+
+        reply.config_hash = self.config_hash
+        reply.config = json.dumps(get_config_subtree(self.config, request.path))
+
+        return reply.SerializeToString()
+
     def on_get_service_info(self, data):
         request = testbed_proto.GetServiceInfoRequest()
         request.ParseFromString(data)
@@ -542,13 +845,14 @@ class Testbed:
         service_ref.id = service_id
         service_ref.type = ref.service_type
         service_ref.state_stream_id = ref.state_stream.stream_id
+        service_ref.resources_stream_id = ref.resources_stream.stream_id
         service_ref.host = self.host
         service_ref.port = ref.port
 
         return reply.SerializeToString()
 
-    def on_register_service(self, data):
-        request = testbed_proto.RegisterServiceRequest()
+    def on_register_and_configure(self, data):
+        request = testbed_proto.RegisterAndConfigureRequest()
         request.ParseFromString(data)
 
         service = self.services[request.service_id]
@@ -563,9 +867,21 @@ class Testbed:
         service.process_id = request.process_id
         service.heartbeat = DataStream.open(request.heartbeat_stream_id)
 
-        reply = testbed_proto.RegisterServiceReply()
+        # Start watching the heartbeat of this service.
+        self.watchdog.schedule(request.service_id, SERVICE_LIVELINESS, self.check_heartbeat)
+
+        if self.resource_sampling_interval:
+            self.watchdog.schedule(('resources', request.service_id), self.resource_sampling_interval, self.sample_resources)
+
+        reply = testbed_proto.RegisterAndConfigureReply()
 
+        # Send only what the service needs to configure itself.
         reply.state_stream_id = service.state_stream.stream_id
+        reply.config = json.dumps(self.config['services'][request.service_id])
+        reply.logging_ingress_port = self.logging_ingress_port
+        reply.data_logging_ingress_port = self.data_logging_ingress_port
+        reply.tracing_ingress_port = self.tracing_ingress_port
+        reply.previous_process_ids.extend(service.previous_process_ids)
 
         return reply.SerializeToString()
 
@@ -575,8 +891,220 @@ class Testbed:
         reply = testbed_proto.ShutDownReply()
         return reply.SerializeToString()
 
-    def start_service(self, service_id):
-        '''Start a service.
+    def start_service(self, service_id, wait=False):
+        '''Start a service and its dependencies.
+
+        See :func:`start_services` for more information.
+
+        Parameters
+        ----------
+        service_id : string
+            The identifier of the service.
+        wait : boolean, optional
+            Whether to wait for the service to start running. By default, this
+            function returns immediately and the service is started in the background.
+
+        Returns
+        -------
+        dictionary or None
+            The startup timeline if `wait` is True, otherwise None.
+        '''
+        return self.start_services([service_id], wait=wait)
+
+    def start_services(self, service_ids, wait=True, timeout=SERVICE_STARTUP_TIMEOUT):
+        '''Start services and all services they depend on.
+
+        Services are launched in dependency order: each service is launched as soon as all of
+        its dependencies are running. Services that do not depend on each other are launched
+        and opened concurrently. If a service fails to start, the services that depend on it
+        are not launched.
+
+        Parameters
+        ----------
+        service_ids : list of strings
+            The identifiers of the services to start.
+        wait : boolean, optional
+            Whether to wait for all services to start running. If this is False, the services
+            are started in a background thread and this function returns immediately. By default True.
+        timeout : float, optional
+            The maximum time in seconds that each service is allowed to take to start running.
+
+        Returns
+        -------
+        dictionary or None
+            The startup timeline, if `wait` is True, otherwise None. This maps each service id onto
+            a dictionary containing the wave in which the service was launched, the times at which it
+            was launched and finished starting in seconds since the start of this call, and its final state.
+
+        Raises
+        ------
+        RuntimeError
+            If the testbed is shutting down or if one of the services is not known.
+        '''
+        if self.shutdown_requested.is_set():
+            raise RuntimeError("The testbed is shutting down. Starting new services is not allowed anymore.")
+
+        for service_id in service_ids:
+            if service_id not in self.services:
+                raise RuntimeError(f'Service "{service_id}" is not a known service.')
+
+        if not wait:
+            thread = threading.Thread(target=self._do_start_services, args=(service_ids, timeout), daemon=True)
+            thread.start()
+
+            return None
+
+        return self._do_start_services(service_ids, timeout)
+
+    def _do_start_services(self, service_ids, timeout):
+        # Gather all services that need to be started, including indirect dependencies.
+        required = set()
+        to_visit = list(service_ids)
+
+        while to_visit:
+            service_id = to_visit.pop()
+
+            if service_id in required:
+                continue
+
+            required.add(service_id)
+            to_visit.extend(self.services[service_id].dependencies)
+
+        start_time = time.time()
+
+        timeline = {}
+        finished = queue.Queue()
+
+        pending = required
+        starting = set()
+        running = set()
+        failed = set()
+
+        def wait_for_service(service_id):
+            finished.put((service_id, self._wait_for_service_to_start(service_id, timeout)))
+
+        while pending or starting:
+            # Launch all services that are ready. Failures propagate through dependents, so
+            # repeat until nothing changes anymore.
+            has_changed = True
+
+            while has_changed:
+                has_changed = False
+
+                for service_id in sorted(pending):
+                    dependencies = self.services[service_id].dependencies
+
+                    if any(dependency in failed for dependency in dependencies):
+                        self.log.error(f'Not starting service "{service_id}", since one of its dependencies failed to start.')
+
+                        pending.remove(service_id)
+                        failed.add(service_id)
+                        has_changed = True
+                    elif all(dependency in running for dependency in dependencies):
+                        pending.remove(service_id)
+                        has_changed = True
+
+                        wave = max([timeline[dependency]['wave'] + 1 for dependency in dependencies], default=0)
+                        timeline[service_id] = {'wave': wave, 'launched': time.time() - start_time}
+
+                        try:
+                            self.launch_service(service_id)
+                        except Exception as e:
+                            self.log.error(f'Could not launch service "{service_id}": {str(e)}')
+
+                            timeline[service_id]['finished'] = time.time() - start_time
+                            timeline[service_id]['state'] = ServiceState.CLOSED
+
+                            failed.add(service_id)
+                            continue
+
+                        starting.add(service_id)
+
+                        thread = threading.Thread(target=wait_for_service, args=(service_id,), daemon=True)
+                        thread.start()
+
+            if not starting:
+                break
+
+            # Wait for any of the starting services to finish starting.
+            service_id, state = finished.get()
+
+            starting.remove(service_id)
+
+            timeline[service_id]['finished'] = time.time() - start_time
+            timeline[service_id]['state'] = state
+
+            if state == ServiceState.RUNNING:
+                running.add(service_id)
+            else:
+                self.log.error(f'Service "{service_id}" failed to start; its state is {state.name}.')
+                failed.add(service_id)
+
+        self.log_startup_timeline(timeline)
+
+        return timeline
+
+    def _wait_for_service_to_start(self, service_id, timeout):
+        '''Wait until a service has finished starting.
+
+        Returns
+        -------
+        ServiceState
+            The state of the service. This is RUNNING if the service started successfully.
+        '''
+        service = self.services[service_id]
+
+        # Use our own reader, to not interfere with other threads waiting on the same stream.
+        state_stream = DataStream.open(service.state_stream.stream_id)
+        deadline = time.time() + timeout
+
+        while True:
+            state = service.state
+
+            if state not in [ServiceState.INITIALIZING, ServiceState.OPENING]:
+                return state
+
+            time_remaining = deadline - time.time()
+
+            if self.shutdown_requested.is_set():
+                return state
+
+            if time_remaining <= 0:
+                self.log.error(f'Service "{service_id}" did not start running within {timeout} seconds.')
+                return state
+
+            try:
+                # Wake up as soon as the service submits a new state, but check for shutdown every second.
+                state_stream.get_next_frame(int(min(time_remaining, 1) * 1000))
+            except RuntimeError:
+                # No new state was submitted.
+                pass
+
+    def log_startup_timeline(self, timeline):
+        '''Log a startup timeline.
+
+        Parameters
+        ----------
+        timeline : dictionary
+            The startup timeline as returned by :func:`start_services`.
+        '''
+        self.startup_timeline.update(timeline)
+
+        if not timeline:
+            return
+
+        self.log.info('Startup timeline:')
+
+        for service_id, entry in sorted(timeline.items(), key=lambda item: item[1]['launched']):
+            duration = entry['finished'] - entry['launched']
+
+            self.log.info(f'  [wave {entry["wave"]}] {service_id}: launched at {entry["launched"]:.2f}s, {entry["state"].name} at {entry["finished"]:.2f}s (took {duration:.2f}s).')
+
+    def launch_service(self, service_id):
+        '''Launch the process for a service.
+
+        This does not start the dependencies of the service and does not wait for
+        the service to start running. Use :func:`start_services` for that instead.
 
         Parameters
         ----------
@@ -584,6 +1112,11 @@ class Testbed:
             The identifier of the service. This should correspond to an entry in the services section of
             the configuration of this testbed.
 
+        Returns
+        -------
+        boolean
+            Whether a new process was launched. This is False if the service was already started.
+
         Raises
         ------
         RuntimeError
@@ -595,14 +1128,21 @@ class Testbed:
         if self.shutdown_requested.is_set():
             raise RuntimeError("The testbed is shutting down. Starting new services is not allowed anymore.")
 
-        self.log.debug(f'Trying to start service "{service_id}".')
-
         if service_id not in self.services:
             raise RuntimeError(f'Service "{service_id}" is not a known service.')
 
-        if self.services[service_id].state not in [ServiceState.CLOSED, ServiceState.CRASHED, ServiceState.FAIL_SAFE]:
-            self.log.debug(f'Service "{service_id}" was already started.')
-            return
+        # Concurrent startups can try to launch the same service.
+        with self.launch_lock:
+            if self.services[service_id].state not in [ServiceState.CLOSED, ServiceState.CRASHED, ServiceState.FAIL_SAFE]:
+                self.log.debug(f'Service "{service_id}" was already started.')
+                return False
+
+            self._launch_service_process(service_id)
+
+        return True
+
+    def _launch_service_process(self, service_id):
+        self.log.debug(f'Trying to start service "{service_id}".')
 
         service_type = self.services[service_id].service_type
 
@@ -641,8 +1181,19 @@ class Testbed:
 
                 self.log.debug(f'with environment variable {key} = {str(value)}.')
 
+        affinity = self.get_cpu_affinity(service_id)
+        priority = self.get_process_priority(service_id)
+
+        # Only Python services can be launched by the fork server.
+        use_fork_server = self.fork_server is not None and executable[0] == sys.executable
+        use_fork_server = use_fork_server and self.config['services'][service_id].get('use_forkserver', True)
+
         # Start process.
-        if sys.platform == 'win32':
+        if use_fork_server:
+            nice = NICE_VALUES[priority] if priority else None
+
+            process = self.fork_server.launch(executable[1], args, dirname, env, affinity, nice)
+        elif sys.platform == 'win32':
             startupinfo = subprocess.STARTUPINFO()
             startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
             creationflags = subprocess.CREATE_NEW_CONSOLE
@@ -667,46 +1218,77 @@ class Testbed:
         self.services[service_id].state = ServiceState.INITIALIZING
         self.services[service_id].process_id = int(process.pid)
         self.services[service_id].port = port
+        self.services[service_id].time_launched = time.time()
 
         self.launched_processes.append(process)
+        self.process_watcher.watch(process)
 
-        # Set CPU affinity
-        if 'cpu_affinity' in self.config['testbed']:
-            affinity_config = self.config['testbed']['cpu_affinity']
+        if use_fork_server:
+            self.log.debug('using the fork server.')
 
-            # Only use affinity if there is an entry for our host name.
-            if self.host_name in affinity_config:
-                default_affinity = affinity_config[self.host_name].get('default')
+        # Set CPU affinity. The fork server already did this in the forked process.
+        if affinity:
+            if not use_fork_server:
+                self.services[service_id].process.cpu_affinity(affinity)
 
-                affinity = affinity_config[self.host_name].get(service_id, default_affinity)
+            self.log.debug(f'with CPU affinity to {affinity}.')
 
-                # Only set affinity if there was one for this service or if there was a default.
-                if affinity:
-                    self.services[service_id].process.cpu_affinity(affinity)
+        # Set process priority. The fork server already did this in the forked process.
+        if priority:
+            if not use_fork_server:
+                self.services[service_id].process.nice(NICE_VALUES[priority])
 
-                    self.log.debug(f'with CPU affinity to {affinity}.')
+            self.log.debug(f'with priority {priority}.')
 
-        # Set process priority
-        if 'process_priority' in self.config['testbed']:
-            priority_config = self.config['testbed']['process_priority']
+        self.log.info(f'Started service "{service_id}" with type "{service_type}".')
 
-            # Only use priority if there is an entry for our host name.
-            if self.host_name in priority_config:
-                default_priority = priority_config[self.host_name].get('default', None)
+    def get_cpu_affinity(self, service_id):
+        '''Get the CPU affinity for a service from the configuration.
 
-                priority = priority_config[self.host_name].get(service_id, default_priority)
+        Parameters
+        ----------
+        service_id : string
+            The identifier of the service.
 
-                # Only set priority if there was one for this service or if there was a default.
-                if priority:
-                    self.services[service_id].process.nice(NICE_VALUES[priority])
+        Returns
+        -------
+        list of ints or None
+            The CPU cores that the service should run on, or None if the
+            CPU affinity should not be changed.
+        '''
+        affinity_config = self.config['testbed'].get('cpu_affinity', {})
 
-                    self.log.debug(f'with priority {priority}.')
+        # Only use affinity if there is an entry for our host name.
+        if self.host_name not in affinity_config:
+            return None
 
-        self.log.info(f'Started service "{service_id}" with type "{service_type}".')
+        default_affinity = affinity_config[self.host_name].get('default')
+
+        return affinity_config[self.host_name].get(service_id, default_affinity)
 
-        # Start the dependencies. This is not required but will speed things up.
-        for dependency in self.services[service_id].dependencies:
-            self.start_service(dependency)
+    def get_process_priority(self, service_id):
+        '''Get the process priority for a service from the configuration.
+
+        Parameters
+        ----------
+        service_id : string
+            The identifier of the service.
+
+        Returns
+        -------
+        string or None
+            The priority of the service, one of the keys of `NICE_VALUES`,
+            or None if the priority should not be changed.
+        '''
+        priority_config = self.config['testbed'].get('process_priority', {})
+
+        # Only use priority if there is an entry for our host name.
+        if self.host_name not in priority_config:
+            return None
+
+        default_priority = priority_config[self.host_name].get('default', None)
+
+        return priority_config[self.host_name].get(service_id, default_priority)
 
     def stop_service(self, service_id):
         self.log.debug(f'Trying to stop service "{service_id}".')
@@ -758,54 +1340,45 @@ class Testbed:
     def shut_down_all_services(self):
         '''Shut down all running services.
 
-        This sends a keyboard interrupt to all running services, and waits for each
-        service to shut down. If a KeyboardInterrupt occurs during this shutdown process,
-        all services that have not shut down already will be killed.
+        Services are shut down in reverse dependency order: a service is asked to shut down as soon
+        as all services that depend on it have exited. Services that do not depend on each other
+        are shut down concurrently, each escalating from a shutdown request to an interrupt and
+        finally to termination if it does not exit in time. If a KeyboardInterrupt occurs during
+        this shutdown process, all services that have not shut down already will be killed.
         '''
-        # Keep track of current shutdown state of services.
-        shutdown_state = {service_id: ('alive', 0) for service_id in self.services.keys()}
+        force_event = threading.Event()
+        finished = queue.Queue()
+
+        remaining = set(self.services.keys())
+        stopping = set()
 
-        while shutdown_state:
+        def shut_down(service_id):
             try:
-                shut_down_services = []
-
-                for service_id, (state, t) in shutdown_state.items():
-                    if self.services[service_id].process is None:
-                        # Service has shut down. Remove it by appending to a remove list.
-                        # This needs to be done as removing elements from a dict directly
-                        # during iteration is not possible in Python.
-                        shut_down_services.append(service_id)
-                        continue
-
-                    # Service is still alive. Check if all its dependents have shut down.
-                    for dependent in self.services[service_id].depended_on_by:
-                        if dependent in shutdown_state:
-                            # At least one dependent is still alive, so we cannot shut this service down yet.
-                            break
-                    else:
-                        # All dependents have been shut down. Try to shut this service down now.
-                        shutdown_state[service_id] = self._shut_down_service_with_leniency(service_id, 60, state, t)
-
-                # Remove stopped services from shutdown state.
-                for service_id in shut_down_services:
-                    del shutdown_state[service_id]
-
-                # Wait a little bit.
-                time.sleep(0.1)
-            except KeyboardInterrupt:
-                # Gather services that we are waiting for.
-                waiting_for = []
+                self._shut_down_service_with_leniency(service_id, 60, force_event)
+            except Exception as e:
+                self.log.error(f'Something went wrong while shutting down service "{service_id}": {str(e)}')
+            finally:
+                finished.put(service_id)
+
+        while remaining:
+            # Start shutting down all services of which all dependents have exited.
+            for service_id in sorted(remaining - stopping):
+                if any(dependent in remaining for dependent in self.services[service_id].depended_on_by):
+                    continue
 
-                for service_id in shutdown_state.keys():
-                    if self.services[service_id].process is None:
-                        continue
+                if self.services[service_id].process is None:
+                    # Service is not running. There is nothing to shut down.
+                    finished.put(service_id)
+                else:
+                    thread = threading.Thread(target=shut_down, args=(service_id,), daemon=True)
+                    thread.start()
 
-                    for dependent in self.services[service_id].depended_on_by:
-                        if dependent in shutdown_state:
-                            # At least one dependent is still alive, so we cannot shut this service down yet.
-                            break
-                    else:
-                        waiting_for.append(service_id)
+                stopping.add(service_id)
+
+            try:
+                service_id = finished.get()
+            except KeyboardInterrupt:
+                waiting_for = sorted(stopping)
 
                 print('Press Ctrl+C again in the next five seconds to force shutdown of:')
                 print(waiting_for)
@@ -813,32 +1386,29 @@ class Testbed:
                 try:
                     time.sleep(5)
                 except KeyboardInterrupt:
-                    for service_id in waiting_for:
-                        shutdown_state[service_id] = self._shut_down_service_with_leniency(service_id, 0, *shutdown_state[service_id])
-
-    def _shut_down_service_with_leniency(self, service_id, leniency_period, state, t):
-        if state == 'alive':
-            # Send shutdown.
-            self.services[service_id].stop()
-
-            # Update shutdown state.
-            return ('stopped', time.time())
-        elif state == 'stopped':
-            # Send interrupt if we have been waiting for long enough.
-            if time.time() - t > leniency_period:
-                self.log.warning(f'Service "{service_id}" is still alive. Interrupting...')
-                self.services[service_id].interrupt()
-
-                # Update shutdown state.
-                return ('interrupted', time.time())
-        elif state == 'interrupted':
-            # Terminate if we have been waiting for long enough.
-            if time.time() - t > leniency_period:
-                self.log.error(f'Service "{service_id}" is still alive, even after interruption. Terminating...')
-                self.services[service_id].terminate()
-
-                # Update shutdown state.
-                return ('terminated', time.time())
-
-        # No changes have been made to the state.
-        return (state, t)
+                    force_event.set()
+
+                continue
+
+            remaining.remove(service_id)
+            stopping.remove(service_id)
+
+    def _shut_down_service_with_leniency(self, service_id, leniency_period, force_event):
+        service = self.services[service_id]
+
+        # Escalate until the service has exited.
+        service.stop()
+
+        if service.wait_for_exit(leniency_period, force_event):
+            return
+
+        self.log.warning(f'Service "{service_id}" is still alive. Interrupting...')
+        service.interrupt()
+
+        if service.wait_for_exit(leniency_period, force_event):
+            return
+
+        self.log.error(f'Service "{service_id}" is still alive, even after interruption. Terminating...')
+        service.terminate()
+
+        service.wait_for_exit()
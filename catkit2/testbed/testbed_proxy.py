@@ -1,7 +1,7 @@
 from .. import catkit_bindings
 
 from .service_proxy import ServiceProxy
-from .proxies import *  # noqa
+from .monitoring import RESOURCE_FIELDS
 
 class TestbedProxy(catkit_bindings.TestbedProxy):
     '''A client for connecting to a testbed server.
@@ -31,7 +31,7 @@ class TestbedProxy(catkit_bindings.TestbedProxy):
             return self._services[service_id]
 
         # Get the service interface class.
-        interface_name = self.config['services'][service_id].get('interface')
+        interface_name = self.get_config(f'/services/{service_id}').get('interface')
         service_proxy_class = ServiceProxy.get_service_interface(interface_name)
 
         # Create proxy and store it in the cache.
@@ -40,6 +40,31 @@ class TestbedProxy(catkit_bindings.TestbedProxy):
 
         return proxy
 
+    def get_resource_usage(self, service_id):
+        '''Get the latest resource usage of the service `service_id`.
+
+        The testbed samples the resource usage of each running service at a low rate.
+        The full history is available from the data stream returned by
+        :func:`get_resource_stream`, which contains the same quantities in the order
+        of `RESOURCE_FIELDS`.
+
+        Parameters
+        ----------
+        service_id : string
+            The identifier for the service.
+
+        Returns
+        -------
+        dictionary
+            The CPU usage in percent of a single core, the resident memory in bytes,
+            the number of threads, the number of open file descriptors, and the total
+            size of the data streams owned by the service in bytes. Quantities that
+            were not sampled yet are NaN.
+        '''
+        sample = self.get_resource_stream(service_id).get()
+
+        return dict(zip(RESOURCE_FIELDS, sample.tolist()))
+
     def __getattr__(self, item):
         '''Get the ServiceProxy named after the attribute.
 
@@ -31,7 +31,7 @@ class TraceWriter:
     def __init__(self, host, port):
         self.f = None
 
-        self.context = zmq.Context()
+        self.context = zmq.Context.instance()
 
         self.host = host
         self.port = port
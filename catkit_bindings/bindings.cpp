@@ -86,6 +86,7 @@ py::dtype GetNumpyDataType(DataType type)
 }
 
 py::object ToPython(const Value &value);
+py::object ToPython(Value &&value);
 
 py::object ToPython(const List &list)
 {
@@ -97,6 +98,16 @@ py::object ToPython(const List &list)
 	return py_list;
 }
 
+py::object ToPython(List &&list)
+{
+	py::list py_list;
+
+	for (auto &item : list)
+		py_list.append(ToPython(std::move(item)));
+
+	return py_list;
+}
+
 py::object ToPython(const Dict &dict)
 {
 	py::dict py_dict;
@@ -107,16 +118,27 @@ py::object ToPython(const Dict &dict)
 	return py_dict;
 }
 
-py::array ToPython(const Tensor &tensor, bool transfer_ownership = true)
+py::object ToPython(Dict &&dict)
 {
-	const Tensor *res;
+	py::dict py_dict;
 
-	// TODO: This actually still makes a copy. Likely every ToPython() function
-	// should be rewritten to use rvalues.
-	if (transfer_ownership)
-		res = new Tensor(std::move(tensor));
-	else
-		res = &tensor;
+	for (auto& [key, val] : dict)
+		py_dict[py::cast(key)] = ToPython(std::move(val));
+
+	return py_dict;
+}
+
+py::array ToPython(Tensor &&tensor)
+{
+	// Move the tensor to the heap and let the Numpy array own it. This
+	// does not copy the underlying data.
+	Tensor *res = new Tensor(std::move(tensor));
+
+	// Make sure the Tensor gets deleted after Python is done with it.
+	py::capsule capsule(res, [](void *ptr)
+	{
+		delete reinterpret_cast<Tensor *>(ptr);
+	});
 
 	size_t item_size = GetSizeOfDataType(res->m_DataType);
 
@@ -128,16 +150,6 @@ py::array ToPython(const Tensor &tensor, bool transfer_ownership = true)
 
 	auto strides = py::detail::c_strides(shape, item_size);
 
-	py::object capsule = py::none();
-
-	if (transfer_ownership)
-	{
-		// Make sure the Tensor gets deleted after Python is done with it.
-		capsule = py::capsule(res, [](void *ptr) {
-			delete reinterpret_cast<Tensor *>(ptr);
-		});
-	}
-
 	return py::array(
 		GetNumpyDataType(res->m_DataType),
 		shape,
@@ -147,44 +159,74 @@ py::array ToPython(const Tensor &tensor, bool transfer_ownership = true)
 	);
 }
 
-py::object ToPython(const Value &value)
+py::array ToPython(const Tensor &tensor, bool copy = true)
 {
-	if (std::holds_alternative<NoneValue>(value))
-	{
-		return py::none();
-	}
-	else if (std::holds_alternative<std::int64_t>(value))
-	{
-		return py::int_(std::get<std::int64_t>(value));
-	}
-	else if (std::holds_alternative<double>(value))
-	{
-		return py::float_(std::get<double>(value));
-	}
-	else if (std::holds_alternative<std::string>(value))
-	{
-		return py::str(std::get<std::string>(value));
-	}
-	else if (std::holds_alternative<bool>(value))
+	if (copy)
 	{
-		return py::bool_(std::get<bool>(value));
-	}
-	else if (std::holds_alternative<Dict>(value))
-	{
-		return ToPython(std::get<Dict>(value));
-	}
-	else if (std::holds_alternative<List>(value))
-	{
-		return ToPython(std::get<List>(value));
+		if (tensor.m_Buffer)
+		{
+			// The data is kept alive by a shared buffer, so we can share it instead of copying.
+			Tensor shared;
+			shared.Set(tensor.m_DataType, tensor.m_NumDimensions, (size_t *) tensor.m_Dimensions, tensor.m_Data, tensor.m_Buffer);
+
+			return ToPython(std::move(shared));
+		}
+
+		return ToPython(Tensor(tensor));
 	}
-	else if (std::holds_alternative<Tensor>(value))
+
+	// Return a view on the data. The caller is responsible for keeping the data alive.
+	size_t item_size = GetSizeOfDataType(tensor.m_DataType);
+
+	std::vector<py::ssize_t> shape;
+	for (size_t i = 0; i < tensor.m_NumDimensions; ++i)
 	{
-		return ToPython(std::get<Tensor>(value));
+		shape.push_back(tensor.m_Dimensions[i]);
 	}
-	else
+
+	auto strides = py::detail::c_strides(shape, item_size);
+
+	return py::array(
+		GetNumpyDataType(tensor.m_DataType),
+		shape,
+		strides,
+		tensor.m_Data,
+		py::none()
+	);
+}
+
+template<typename ValueType>
+py::object ValueToPython(ValueType &&value)
+{
+	// Forward the value category to the alternatives, so that held
+	// tensors are moved into Python if the value is an rvalue.
+	return std::visit([](auto &&item) -> py::object
 	{
-		throw std::runtime_error("Unknown value type.");
-	}
+		using T = std::decay_t<decltype(item)>;
+
+		if constexpr (std::is_same_v<T, NoneValue>)
+			return py::none();
+		else if constexpr (std::is_same_v<T, std::int64_t>)
+			return py::int_(item);
+		else if constexpr (std::is_same_v<T, double>)
+			return py::float_(item);
+		else if constexpr (std::is_same_v<T, std::string>)
+			return py::str(item);
+		else if constexpr (std::is_same_v<T, bool>)
+			return py::bool_(item);
+		else
+			return ToPython(std::forward<decltype(item)>(item));
+	}, std::forward<ValueType>(value));
+}
+
+py::object ToPython(const Value &value)
+{
+	return ValueToPython(value);
+}
+
+py::object ToPython(Value &&value)
+{
+	return ValueToPython(std::move(value));
 }
 
 Value ValueFromPython(const py::handle &python_value)
@@ -227,8 +269,16 @@ Value ValueFromPython(const py::handle &python_value)
 				throw std::runtime_error("Input array must be C continguous.");
 		}
 
+		// Borrow the data from the Python buffer, rather than copying it. The buffer
+		// is kept alive and locked for as long as the tensor refers to it.
+		std::shared_ptr<void> owner(new py::buffer_info(std::move(buffer_info)), [](void *ptr)
+		{
+			py::gil_scoped_acquire acquire;
+			delete reinterpret_cast<py::buffer_info *>(ptr);
+		});
+
 		Tensor tensor;
-		tensor.Set(dtype, ndim, shape, (const char *) data);
+		tensor.Set(dtype, ndim, shape, (char *) data, owner);
 
 		return tensor;
 	}
@@ -450,13 +500,11 @@ PYBIND11_MODULE(catkit_bindings, m)
 		})
 		.def("set_property", [](ServiceProxy &service, std::string name, py::handle obj)
 		{
-			auto val = service.SetProperty(name, ValueFromPython(obj), error_check_python);
-			return ToPython(val);
+			return ToPython(service.SetProperty(name, ValueFromPython(obj), error_check_python));
 		})
 		.def("execute_command", [](ServiceProxy &service, std::string name, py::dict args)
 		{
-			auto res = service.ExecuteCommand(name, std::get<Dict>(ValueFromPython(args)), error_check_python);
-			return ToPython(res);
+			return ToPython(service.ExecuteCommand(name, std::get<Dict>(ValueFromPython(args)), error_check_python));
 		})
 		.def("get_data_stream", [](ServiceProxy &service, std::string name)
 		{
@@ -497,11 +545,14 @@ PYBIND11_MODULE(catkit_bindings, m)
 		.def("stop_service", &TestbedProxy::StopService)
 		.def("interrupt_service", &TestbedProxy::InterruptService)
 		.def("terminate_service", &TestbedProxy::TerminateService)
+		.def("get_resource_stream", &TestbedProxy::GetResourceStream)
 		.def("shut_down", &TestbedProxy::ShutDown)
 		.def_property_readonly("is_simulated", &TestbedProxy::IsSimulated)
 		.def_property_readonly("is_alive", &TestbedProxy::IsAlive)
 		.def_property_readonly("heartbeat", &TestbedProxy::GetHeartbeat)
-		.def_property_readonly("config", &TestbedProxy::GetConfig)
+		.def_property_readonly("config", py::overload_cast<>(&TestbedProxy::GetConfig))
+		.def("get_config", py::overload_cast<const std::string &>(&TestbedProxy::GetConfig), py::arg("path") = "")
+		.def_property_readonly("config_hash", &TestbedProxy::GetConfigHash)
 		.def_property_readonly("host", &TestbedProxy::GetHost)
 		.def_property_readonly("port", &TestbedProxy::GetPort)
 		.def_property_readonly("logging_egress_port", &TestbedProxy::GetLoggingEgressPort)
@@ -19,6 +19,13 @@ const int SOCKET_TIMEOUT = 60000;  // milliseconds.
 Client::Client(std::string host, int port)
     : m_Host(host), m_Port(port)
 {
+	m_SocketPool = GetSocketPool("tcp://"s + host + ":" + to_string(port), ZMQ_REQ, [](zmq::socket_t &socket)
+	{
+		socket.set(zmq::sockopt::rcvtimeo, SOCKET_TIMEOUT);
+		socket.set(zmq::sockopt::linger, 0);
+		socket.set(zmq::sockopt::req_relaxed, 1);
+		socket.set(zmq::sockopt::req_correlate, 1);
+	});
 }
 
 Client::~Client()
@@ -27,13 +34,27 @@ Client::~Client()
 
 string Client::MakeRequest(const string &what, const string &request)
 {
-    auto socket = GetSocket();
+	MessageFrames request_frames;
+	MessageFrames reply_frames;
+
+	return MakeRequest(what, request, request_frames, reply_frames);
+}
+
+string Client::MakeRequest(const string &what, const string &request, MessageFrames &request_frames, MessageFrames &reply_frames)
+{
+    auto socket = m_SocketPool->GetSocket();
 
 	zmq::multipart_t request_msg;
 
 	request_msg.addstr(what);
 	request_msg.addstr(request);
 
+	// Any extra frames are sent after the request data.
+	for (auto &frame : request_frames)
+		request_msg.add(std::move(frame));
+
+	request_frames.clear();
+
 	request_msg.send(*socket);
 
 	Timer timer;
@@ -49,15 +70,19 @@ string Client::MakeRequest(const string &what, const string &request)
 			throw std::runtime_error("The server did not respond in time. Is it running?");
 		}
 
-		if (reply_msg.size() != 2)
+		if (reply_msg.size() < 2)
 		{
-			LOG_ERROR("The server responded with " + std::to_string(reply_msg.size()) + " parts rather than 2.");
+			LOG_ERROR("The server responded with " + std::to_string(reply_msg.size()) + " parts rather than at least 2.");
 			throw std::runtime_error("The server responded in a wrong format.");
 		}
 
 		std::string reply_type = reply_msg.popstr();
 		std::string reply_data = reply_msg.popstr();
 
+		reply_frames.clear();
+		while (!reply_msg.empty())
+			reply_frames.push_back(reply_msg.pop());
+
 		if (reply_type == "OK")
 		{
 			return reply_data;
@@ -88,33 +113,3 @@ int Client::GetPort()
 {
 	return m_Port;
 }
-
-Client::socket_ptr Client::GetSocket()
-{
-	std::scoped_lock<std::mutex> lock(m_Mutex);
-
-	zmq::socket_t *socket;
-	if (m_Sockets.empty())
-	{
-		LOG_DEBUG("Creating new socket.");
-
-		socket = new zmq::socket_t(m_Context, ZMQ_REQ);
-
-		socket->set(zmq::sockopt::rcvtimeo, SOCKET_TIMEOUT);
-		socket->set(zmq::sockopt::linger, 0);
-		socket->set(zmq::sockopt::req_relaxed, 1);
-		socket->set(zmq::sockopt::req_correlate, 1);
-
-		socket->connect("tcp://"s + m_Host + ":" + to_string(m_Port));
-	}
-	else
-	{
-		socket = m_Sockets.top().release();
-		m_Sockets.pop();
-	}
-
-	return socket_ptr(socket, [this](zmq::socket_t *ptr)
-		{
-			this->m_Sockets.emplace(ptr);
-		});
-}
\ No newline at end of file
@@ -2,13 +2,13 @@
 #define CLIENT_H
 
 #include <string>
-#include <mutex>
-#include <functional>
 #include <memory>
-#include <stack>
 
 #include <zmq.hpp>
 
+#include "MessageFrames.h"
+#include "Registry.h"
+
 class Client
 {
 public:
@@ -19,18 +19,14 @@ public:
 	int GetPort();
 
 	std::string MakeRequest(const std::string &what, const std::string &request);
+	std::string MakeRequest(const std::string &what, const std::string &request, MessageFrames &request_frames, MessageFrames &reply_frames);
 
 private:
 	std::string m_Host;
 	int m_Port;
 
-	zmq::context_t m_Context;
-
-	typedef std::unique_ptr<zmq::socket_t, std::function<void(zmq::socket_t *)>> socket_ptr;
-	socket_ptr GetSocket();
-
-	std::mutex m_Mutex;
-	std::stack<std::unique_ptr<zmq::socket_t>> m_Sockets;
+	// Sockets are shared with all other clients connecting to the same server.
+	std::shared_ptr<SocketPool> m_SocketPool;
 };
 
 template<typename ProtoRequest>
@@ -62,6 +62,8 @@ enum BufferHandlingMode
 	BM_OLDEST_FIRST_OVERWRITE
 };
 
+std::string MakeStreamId(const std::string &stream_name, const std::string &service_id, int pid);
+
 class DataStream
 {
 private:
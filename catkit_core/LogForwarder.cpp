@@ -1,5 +1,7 @@
 #include "LogForwarder.h"
 
+#include "Registry.h"
+
 #include <nlohmann/json.hpp>
 #include <iostream>
 
@@ -51,8 +53,7 @@ void LogForwarder::AddLogEntry(const LogEntry &entry)
 
 void LogForwarder::MessageLoop()
 {
-	context_t context;
-	socket_t socket(context, ZMQ_PUSH);
+	socket_t socket(GetZmqContext(), ZMQ_PUSH);
 
 	socket.set(zmq::sockopt::linger, 0);
 	socket.set(zmq::sockopt::sndtimeo, 10);
@@ -0,0 +1,13 @@
+#ifndef MESSAGE_FRAMES_H
+#define MESSAGE_FRAMES_H
+
+#include <zmq.hpp>
+
+#include <vector>
+
+// Extra message frames sent alongside a serialized protobuf message.
+// These carry large binary payloads (ie. tensor data) out-of-band, so
+// that they do not need to be copied into and out of the protobuf message.
+typedef std::vector<zmq::message_t> MessageFrames;
+
+#endif // MESSAGE_FRAMES_H
@@ -0,0 +1,72 @@
+#include "Registry.h"
+
+#include "Log.h"
+
+#include <map>
+
+zmq::context_t &GetZmqContext()
+{
+	// This context is intentionally never destroyed. Destroying it would block
+	// until all sockets are closed, including those owned by other static objects
+	// (ie. the tracing proxy) which might be destroyed after this context.
+	static zmq::context_t *context = new zmq::context_t();
+
+	return *context;
+}
+
+SocketPool::SocketPool(std::string endpoint, int socket_type, SocketSetup setup)
+	: m_Endpoint(endpoint), m_SocketType(socket_type), m_Setup(setup)
+{
+}
+
+SocketPool::socket_ptr SocketPool::GetSocket()
+{
+	std::scoped_lock<std::mutex> lock(m_Mutex);
+
+	zmq::socket_t *socket;
+	if (m_Sockets.empty())
+	{
+		LOG_DEBUG("Creating new socket.");
+
+		socket = new zmq::socket_t(GetZmqContext(), m_SocketType);
+
+		if (m_Setup)
+			m_Setup(*socket);
+
+		socket->connect(m_Endpoint);
+	}
+	else
+	{
+		socket = m_Sockets.top().release();
+		m_Sockets.pop();
+	}
+
+	// Keep the pool alive for as long as the socket is in use.
+	auto pool = shared_from_this();
+
+	return socket_ptr(socket, [pool](zmq::socket_t *ptr)
+		{
+			std::scoped_lock<std::mutex> lock(pool->m_Mutex);
+			pool->m_Sockets.emplace(ptr);
+		});
+}
+
+std::string SocketPool::GetEndpoint()
+{
+	return m_Endpoint;
+}
+
+std::shared_ptr<SocketPool> GetSocketPool(const std::string &endpoint, int socket_type, SocketPool::SocketSetup setup)
+{
+	static std::mutex mutex;
+	static std::map<std::pair<std::string, int>, std::shared_ptr<SocketPool>> pools;
+
+	std::scoped_lock<std::mutex> lock(mutex);
+
+	auto &pool = pools[{endpoint, socket_type}];
+
+	if (!pool)
+		pool = std::make_shared<SocketPool>(endpoint, socket_type, setup);
+
+	return pool;
+}
@@ -0,0 +1,42 @@
+#ifndef REGISTRY_H
+#define REGISTRY_H
+
+#include <zmq.hpp>
+
+#include <string>
+#include <mutex>
+#include <functional>
+#include <memory>
+#include <stack>
+
+// The ZeroMQ context shared by all sockets in this process.
+zmq::context_t &GetZmqContext();
+
+// A pool of connected sockets to a single endpoint.
+class SocketPool : public std::enable_shared_from_this<SocketPool>
+{
+public:
+	typedef std::function<void(zmq::socket_t &)> SocketSetup;
+	typedef std::unique_ptr<zmq::socket_t, std::function<void(zmq::socket_t *)>> socket_ptr;
+
+	SocketPool(std::string endpoint, int socket_type, SocketSetup setup);
+
+	// Get a socket for exclusive use. It is returned to the pool when it goes out of scope.
+	socket_ptr GetSocket();
+
+	std::string GetEndpoint();
+
+private:
+	std::string m_Endpoint;
+	int m_SocketType;
+	SocketSetup m_Setup;
+
+	std::mutex m_Mutex;
+	std::stack<std::unique_ptr<zmq::socket_t>> m_Sockets;
+};
+
+// Get the socket pool for an endpoint, creating it if it does not exist yet.
+// The socket type and setup are only used when the pool is created.
+std::shared_ptr<SocketPool> GetSocketPool(const std::string &endpoint, int socket_type, SocketPool::SocketSetup setup);
+
+#endif // REGISTRY_H
@@ -4,6 +4,7 @@
 #include "Timing.h"
 #include "Finally.h"
 #include "Util.h"
+#include "Registry.h"
 
 #include <zmq_addon.hpp>
 
@@ -26,6 +27,14 @@ Server::~Server()
 }
 
 void Server::RegisterRequestHandler(std::string type, RequestHandler func)
+{
+	m_RequestHandlers[type] = [func](const std::string &data, MessageFrames &request_frames, MessageFrames &reply_frames)
+	{
+		return func(data);
+	};
+}
+
+void Server::RegisterRequestHandler(std::string type, FramedRequestHandler func)
 {
 	m_RequestHandlers[type] = func;
 }
@@ -53,9 +62,7 @@ void Server::RunInternal()
 {
 	LOG_INFO("Starting server on port "s + to_string(m_Port) + ".");
 
-	zmq::context_t context;
-
-	zmq::socket_t socket(context, ZMQ_ROUTER);
+	zmq::socket_t socket(GetZmqContext(), ZMQ_ROUTER);
 	socket.bind("tcp://*:"s + std::to_string(m_Port));
 	socket.set(zmq::sockopt::rcvtimeo, 20);
 	socket.set(zmq::sockopt::linger, 0);
@@ -81,10 +88,10 @@ void Server::RunInternal()
 			continue;
 		}
 
-		if (request_msg.size() != 5)
+		if (request_msg.size() < 5)
 		{
-			// Each message should have five frames: request_id, identity, empty, type and data.
-			LOG_ERROR("The server has received a message with "s + std::to_string(request_msg.size()) + " frames instead of five. Ignoring.");
+			// Each message should have at least five frames: request_id, identity, empty, type and data.
+			LOG_ERROR("The server has received a message with "s + std::to_string(request_msg.size()) + " frames instead of at least five. Ignoring.");
 			continue;
 		}
 
@@ -94,6 +101,13 @@ void Server::RunInternal()
 		std::string request_type = request_msg.popstr();
 		std::string request_data = request_msg.popstr();
 
+		// Any remaining frames carry out-of-band data for the request.
+		MessageFrames request_frames;
+		while (!request_msg.empty())
+			request_frames.push_back(request_msg.pop());
+
+		MessageFrames reply_frames;
+
 		LOG_DEBUG("Request received: "s + request_type);
 
 		// Call the request handler and return the result if no error occurred.
@@ -113,7 +127,7 @@ void Server::RunInternal()
 		{
 			try
 			{
-				reply_data = handler->second(request_data);
+				reply_data = handler->second(request_data, request_frames, reply_frames);
 			}
 			catch (std::exception &e)
 			{
@@ -121,6 +135,7 @@ void Server::RunInternal()
 
 				reply_type = "ERROR";
 				reply_data = e.what();
+				reply_frames.clear();
 			}
 		}
 
@@ -133,6 +148,9 @@ void Server::RunInternal()
 		msg.addstr(reply_type);
 		msg.addstr(reply_data);
 
+		for (auto &frame : reply_frames)
+			msg.add(std::move(frame));
+
 		msg.send(socket);
 
 		LOG_DEBUG("Sent reply: "s + reply_type);
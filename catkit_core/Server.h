@@ -7,6 +7,8 @@
 #include <map>
 #include <thread>
 
+#include "MessageFrames.h"
+
 class Server
 {
 public:
@@ -14,8 +16,10 @@ public:
 	virtual ~Server();
 
 	typedef std::function<std::string(const std::string&)> RequestHandler;
+	typedef std::function<std::string(const std::string&, MessageFrames&, MessageFrames&)> FramedRequestHandler;
 
 	void RegisterRequestHandler(std::string type, RequestHandler func);
+	void RegisterRequestHandler(std::string type, FramedRequestHandler func);
 
 	void Start();
 	void Stop();
@@ -34,7 +38,7 @@ private:
 
     std::thread m_RunThread;
 
-	std::map<std::string, RequestHandler> m_RequestHandlers;
+	std::map<std::string, FramedRequestHandler> m_RequestHandlers;
 
 	std::atomic_bool m_IsRunning;
 	std::atomic_bool m_ShouldShutDown;
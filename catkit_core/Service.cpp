@@ -28,15 +28,11 @@ Service::Service(string service_type, string service_id, int service_port, int t
 	m_IsRunning(false), m_ShouldShutDown(false), m_FailSafe(false)
 {
 	m_Testbed = make_shared<TestbedProxy>("127.0.0.1", testbed_port);
-	m_Config = m_Testbed->GetConfig()["services"][service_id];
-
-	m_LoggerPublish.Connect(service_id, "tcp://127.0.0.1:"s + to_string(m_Testbed->GetLoggingIngressPort()));
 
 	m_Heartbeat = DataStream::Create("heartbeat", service_id, DataType::DT_UINT64, {1}, 20);
 
-	tracing_proxy.Connect(service_id, "127.0.0.1", m_Testbed->GetTracingIngressPort());
-
-	string state_stream_id = m_Testbed->RegisterService(
+	// Register with the testbed. This also returns everything we need to configure ourselves.
+	auto registration = m_Testbed->RegisterAndConfigure(
 		service_id,
 		service_type,
 		"127.0.0.1",
@@ -45,15 +41,22 @@ Service::Service(string service_type, string service_id, int service_port, int t
 		m_Heartbeat->GetStreamId()
 	);
 
-	m_State = DataStream::Open(state_stream_id);
+	m_Config = registration.config;
+	m_PreviousProcessIds = registration.previous_process_ids;
+
+	m_LoggerPublish.Connect(service_id, "tcp://127.0.0.1:"s + to_string(registration.logging_ingress_port));
+
+	tracing_proxy.Connect(service_id, "127.0.0.1", registration.tracing_ingress_port);
+
+	m_State = DataStream::Open(registration.state_stream_id);
 	UpdateState(ServiceState::INITIALIZING);
 
 	LOG_DEBUG("Registering request handlers.");
 
 	m_Server.RegisterRequestHandler("get_info", [this](const string &data) { return this->HandleGetInfo(data); });
-	m_Server.RegisterRequestHandler("get_property", [this](const string &data) { return this->HandleGetProperty(data); });
-	m_Server.RegisterRequestHandler("set_property", [this](const string &data) { return this->HandleSetProperty(data); });
-	m_Server.RegisterRequestHandler("execute_command", [this](const string &data) { return this->HandleExecuteCommand(data); });
+	m_Server.RegisterRequestHandler("get_property", [this](const string &data, MessageFrames &request_frames, MessageFrames &reply_frames) { return this->HandleGetProperty(data, request_frames, reply_frames); });
+	m_Server.RegisterRequestHandler("set_property", [this](const string &data, MessageFrames &request_frames, MessageFrames &reply_frames) { return this->HandleSetProperty(data, request_frames, reply_frames); });
+	m_Server.RegisterRequestHandler("execute_command", [this](const string &data, MessageFrames &request_frames, MessageFrames &reply_frames) { return this->HandleExecuteCommand(data, request_frames, reply_frames); });
 	m_Server.RegisterRequestHandler("shut_down", [this](const string &data) { return this->HandleShutDown(data); });
 
 	LOG_INFO("Intialized service.");
@@ -402,6 +405,38 @@ void Service::MakeCommand(std::string command_name, Command::CommandFunction fun
 
 std::shared_ptr<DataStream> Service::MakeDataStream(std::string stream_name, DataType type, std::vector<size_t> dimensions, size_t num_frames_in_buffer)
 {
+	// If this service is restarted after a crash, the data streams of the crashed
+	// process still exist. Reuse those, so that clients can keep reading from them.
+	for (int process_id : m_PreviousProcessIds)
+	{
+		std::shared_ptr<DataStream> previous_stream;
+
+		try
+		{
+			previous_stream = DataStream::Open(MakeStreamId(stream_name, GetId(), process_id));
+		}
+		catch (std::exception &)
+		{
+			// The data stream did not exist for this process.
+			continue;
+		}
+
+		if (!previous_stream)
+			continue;
+
+		bool is_compatible = previous_stream->GetDataType() == type
+			&& previous_stream->GetDimensions() == dimensions
+			&& previous_stream->GetNumFramesInBuffer() == num_frames_in_buffer;
+
+		if (!is_compatible)
+		{
+			LOG_WARNING("The previous data stream \"" + stream_name + "\" has a different shape or type. Making a new one.");
+			break;
+		}
+
+		return ReuseDataStream(stream_name, previous_stream->GetStreamId());
+	}
+
 	LOG_DEBUG("Making data stream \"" + stream_name + "\".");
 
 	auto stream = DataStream::Create(stream_name, GetId(), type, dimensions, num_frames_in_buffer);
@@ -456,7 +491,7 @@ string Service::HandleGetInfo(const string &data)
 	return reply_string;
 }
 
-string Service::HandleGetProperty(const string &data)
+string Service::HandleGetProperty(const string &data, MessageFrames &request_frames, MessageFrames &reply_frames)
 {
 	catkit_proto::service::GetPropertyRequest request;
 	request.ParseFromString(data);
@@ -470,7 +505,7 @@ string Service::HandleGetProperty(const string &data)
 	auto value = property->Get();
 
 	catkit_proto::service::GetPropertyReply reply;
-	ToProto(value, reply.mutable_property_value());
+	ToProto(value, reply.mutable_property_value(), &reply_frames);
 
 	string reply_string;
 	reply.SerializeToString(&reply_string);
@@ -478,7 +513,7 @@ string Service::HandleGetProperty(const string &data)
 	return reply_string;
 }
 
-string Service::HandleSetProperty(const string &data)
+string Service::HandleSetProperty(const string &data, MessageFrames &request_frames, MessageFrames &reply_frames)
 {
 	catkit_proto::service::SetPropertyRequest request;
 	request.ParseFromString(data);
@@ -490,13 +525,13 @@ string Service::HandleSetProperty(const string &data)
 		throw std::runtime_error("Property \""s + property_name + "\" does not exist.");
 
 	Value set_value;
-	FromProto(&request.property_value(), set_value);
+	FromProto(&request.property_value(), set_value, &request_frames);
 	property->Set(set_value);
 
 	auto value = property->Get();
 
 	catkit_proto::service::SetPropertyReply reply;
-	ToProto(value, reply.mutable_property_value());
+	ToProto(value, reply.mutable_property_value(), &reply_frames);
 
 	string reply_string;
 	reply.SerializeToString(&reply_string);
@@ -504,7 +539,7 @@ string Service::HandleSetProperty(const string &data)
 	return reply_string;
 }
 
-string Service::HandleExecuteCommand(const string &data)
+string Service::HandleExecuteCommand(const string &data, MessageFrames &request_frames, MessageFrames &reply_frames)
 {
 	catkit_proto::service::ExecuteCommandRequest request;
 	request.ParseFromString(data);
@@ -516,11 +551,11 @@ string Service::HandleExecuteCommand(const string &data)
 		throw std::runtime_error("Command \""s + command_name + "\" does not exist.");
 
 	Dict args;
-	FromProto(&request.arguments(), args);
+	FromProto(&request.arguments(), args, &request_frames);
 	auto res = command->Execute(args);
 
 	catkit_proto::service::ExecuteCommandReply reply;
-	ToProto(res, reply.mutable_result());
+	ToProto(res, reply.mutable_result(), &reply_frames);
 
 	string reply_string;
 	reply.SerializeToString(&reply_string);
@@ -56,10 +56,10 @@ public:
 private:
 	std::string HandleGetInfo(const std::string &data);
 
-	std::string HandleGetProperty(const std::string &data);
-	std::string HandleSetProperty(const std::string &data);
+	std::string HandleGetProperty(const std::string &data, MessageFrames &request_frames, MessageFrames &reply_frames);
+	std::string HandleSetProperty(const std::string &data, MessageFrames &request_frames, MessageFrames &reply_frames);
 
-	std::string HandleExecuteCommand(const std::string &data);
+	std::string HandleExecuteCommand(const std::string &data, MessageFrames &request_frames, MessageFrames &reply_frames);
 
 	std::string HandleShutDown(const std::string &data);
 
@@ -84,6 +84,8 @@ private:
 
 	nlohmann::json m_Config;
 
+	std::vector<int> m_PreviousProcessIds;
+
 	std::shared_ptr<DataStream> m_Heartbeat;
 	std::shared_ptr<DataStream> m_Safety;
 	std::shared_ptr<DataStream> m_State;
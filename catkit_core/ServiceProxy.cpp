@@ -11,15 +11,18 @@
 using namespace std::string_literals;
 
 const double TIMEOUT_TO_START = 120;  // seconds
+const double STATE_WAIT_SLICE = 0.1;  // seconds
 
 ServiceProxy::ServiceProxy(std::shared_ptr<TestbedProxy> testbed, std::string service_id)
 	: m_Testbed(testbed), m_ServiceId(service_id), m_Client(nullptr), m_State(nullptr),
 	m_TimeLastConnect(0)
 {
 	// Do a check to see if the service id is correct.
-	auto testbed_config = testbed->GetConfig();
-
-	if (!testbed_config["services"].contains(service_id))
+	try
+	{
+		testbed->GetConfig("/services/"s + service_id);
+	}
+	catch (...)
 	{
 		throw std::runtime_error("Service "s + service_id + " is a nonexistent service id.");
 	}
@@ -73,13 +76,16 @@ Value ServiceProxy::GetProperty(const std::string &name, void (*error_check)())
 	catkit_proto::service::GetPropertyRequest request;
 	request.set_property_name(name);
 
-	std::string reply_string = m_Client->MakeRequest("get_property", Serialize(request));
+	MessageFrames request_frames;
+	MessageFrames reply_frames;
+
+	std::string reply_string = m_Client->MakeRequest("get_property", Serialize(request), request_frames, reply_frames);
 
 	catkit_proto::service::GetPropertyReply reply;
 	reply.ParseFromString(reply_string);
 
 	Value res;
-	FromProto(&reply.property_value(), res);
+	FromProto(&reply.property_value(), res, &reply_frames);
 
 	return res;
 }
@@ -95,15 +101,18 @@ Value ServiceProxy::SetProperty(const std::string &name, const Value &value, voi
 
 	catkit_proto::service::SetPropertyRequest request;
 	request.set_property_name(name);
-	ToProto(value, request.mutable_property_value());
 
-	std::string reply_string = m_Client->MakeRequest("set_property", Serialize(request));
+	MessageFrames request_frames;
+	MessageFrames reply_frames;
+	ToProto(value, request.mutable_property_value(), &request_frames);
+
+	std::string reply_string = m_Client->MakeRequest("set_property", Serialize(request), request_frames, reply_frames);
 
 	catkit_proto::service::SetPropertyReply reply;
 	reply.ParseFromString(reply_string);
 
 	Value res;
-	FromProto(&reply.property_value(), res);
+	FromProto(&reply.property_value(), res, &reply_frames);
 
 	return res;
 }
@@ -119,15 +128,18 @@ Value ServiceProxy::ExecuteCommand(const std::string &name, const Dict &argument
 
 	catkit_proto::service::ExecuteCommandRequest request;
 	request.set_command_name(name);
-	ToProto(arguments, request.mutable_arguments());
 
-	std::string reply_string = m_Client->MakeRequest("execute_command", Serialize(request));
+	MessageFrames request_frames;
+	MessageFrames reply_frames;
+	ToProto(arguments, request.mutable_arguments(), &request_frames);
+
+	std::string reply_string = m_Client->MakeRequest("execute_command", Serialize(request), request_frames, reply_frames);
 
 	catkit_proto::service::ExecuteCommandReply reply;
 	reply.ParseFromString(reply_string);
 
 	Value res;
-	FromProto(&reply.result(), res);
+	FromProto(&reply.result(), res, &reply_frames);
 
 	return res;
 }
@@ -218,7 +230,15 @@ void ServiceProxy::Start(double timeout_in_sec, void (*error_check)())
 			if (timeout_remaining <= 0)
 				throw std::runtime_error("The service has not started within the timeout time.");
 
-			std::this_thread::sleep_for(std::chrono::duration<double>(std::min(double(0.001), timeout_remaining)));
+			// Wait for the next state change of the service instead of polling.
+			try
+			{
+				m_State->GetNextFrame(long(std::min(STATE_WAIT_SLICE, timeout_remaining) * 1000) + 1);
+			}
+			catch (std::runtime_error &)
+			{
+				// No new state was submitted within this time.
+			}
 
 			if (error_check)
 				error_check();
@@ -363,7 +383,7 @@ std::vector<std::string> ServiceProxy::GetDataStreamNames(void (*error_check)())
 
 nlohmann::json ServiceProxy::GetConfig()
 {
-	return m_Testbed->GetConfig()["services"][m_ServiceId];
+	return m_Testbed->GetConfig("/services/"s + m_ServiceId);
 }
 
 std::string ServiceProxy::GetId()
@@ -1,6 +1,28 @@
 #include "SharedMemory.h"
 
 #include <stdexcept>
+#include <map>
+#include <mutex>
+
+// Shared memory that is currently mapped into this process, keyed by id.
+// Opening the same shared memory multiple times reuses the existing mapping.
+static std::mutex mapped_shared_memory_mutex;
+static std::map<std::string, std::weak_ptr<SharedMemory>> mapped_shared_memory;
+
+static std::shared_ptr<SharedMemory> FindMappedSharedMemory(const std::string &id)
+{
+	auto it = mapped_shared_memory.find(id);
+
+	if (it == mapped_shared_memory.end())
+		return nullptr;
+
+	auto shared_memory = it->second.lock();
+
+	if (!shared_memory)
+		mapped_shared_memory.erase(it);
+
+	return shared_memory;
+}
 
 SharedMemory::~SharedMemory()
 {
@@ -24,6 +46,8 @@ SharedMemory::~SharedMemory()
 
 std::shared_ptr<SharedMemory> SharedMemory::Create(const std::string &id, size_t num_bytes_in_buffer)
 {
+	std::scoped_lock<std::mutex> lock(mapped_shared_memory_mutex);
+
 #ifdef _WIN32
 	FileObject file = CreateFileMapping(INVALID_HANDLE_VALUE, NULL, PAGE_READWRITE, 0, (DWORD) num_bytes_in_buffer, (id + ".mem").c_str());
 
@@ -46,11 +70,21 @@ std::shared_ptr<SharedMemory> SharedMemory::Create(const std::string &id, size_t
 	}
 #endif
 
-	return std::shared_ptr<SharedMemory>(new SharedMemory(id, file, true));
+	auto shared_memory = std::shared_ptr<SharedMemory>(new SharedMemory(id, file, true));
+	mapped_shared_memory[id] = shared_memory;
+
+	return shared_memory;
 }
 
 std::shared_ptr<SharedMemory> SharedMemory::Open(const std::string &id)
 {
+	std::scoped_lock<std::mutex> lock(mapped_shared_memory_mutex);
+
+	auto existing = FindMappedSharedMemory(id);
+
+	if (existing)
+		return existing;
+
 #ifdef _WIN32
 	FileObject file = OpenFileMapping(FILE_MAP_ALL_ACCESS, FALSE, (id + ".mem").c_str());
 
@@ -63,7 +97,10 @@ std::shared_ptr<SharedMemory> SharedMemory::Open(const std::string &id)
 		throw std::runtime_error("Something went wrong while opening shared memory.");
 #endif
 
-	return std::shared_ptr<SharedMemory>(new SharedMemory(id, file, false));
+	auto shared_memory = std::shared_ptr<SharedMemory>(new SharedMemory(id, file, false));
+	mapped_shared_memory[id] = shared_memory;
+
+	return shared_memory;
 }
 
 SharedMemory::SharedMemory(const std::string &id, FileObject file, bool is_owner)
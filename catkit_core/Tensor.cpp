@@ -1,6 +1,7 @@
 #include "Tensor.h"
 
 #include <algorithm>
+#include <cstdint>
 
 using namespace std;
 
@@ -166,6 +167,7 @@ Tensor &Tensor::operator=(Tensor &&other)
 	std::copy(other.m_Dimensions, other.m_Dimensions + 4, m_Dimensions);
 	m_Data = std::move(other.m_Data);
 	m_IsOwner = std::move(other.m_IsOwner);
+	m_Buffer = std::move(other.m_Buffer);
 
 	other.m_IsOwner = false;
 
@@ -205,6 +207,8 @@ void Tensor::SetCommon(DataType data_type, size_t num_dimensions, size_t *dimens
 		m_Data = nullptr;
 	}
 
+	m_Buffer.reset();
+
 	m_DataType = data_type;
 	m_NumDimensions = num_dimensions;
 	std::copy(dimensions, dimensions + 4, m_Dimensions);
@@ -232,6 +236,16 @@ void Tensor::Set(DataType data_type, size_t num_dimensions, size_t *dimensions,
 	m_IsOwner = true;
 }
 
+void Tensor::Set(DataType data_type, size_t num_dimensions, size_t *dimensions, char *data, std::shared_ptr<void> buffer)
+{
+	SetCommon(data_type, num_dimensions, dimensions);
+
+	m_Data = data;
+	m_Buffer = buffer;
+
+	m_IsOwner = false;
+}
+
 size_t Tensor::GetNumElements() const
 {
 	return m_Dimensions[0] * m_Dimensions[1] * m_Dimensions[2] * m_Dimensions[3];
@@ -242,17 +256,29 @@ size_t Tensor::GetSizeInBytes() const
 	return GetNumElements() * GetSizeOfDataType(m_DataType);
 }
 
-void ToProto(const Tensor &tensor, catkit_proto::Tensor *proto_tensor)
+void ToProto(const Tensor &tensor, catkit_proto::Tensor *proto_tensor, MessageFrames *frames)
 {
 	proto_tensor->set_dtype(GetDataTypeAsString(tensor.GetDataType()));
 
 	for (size_t i = 0; i < tensor.GetNumDimensions(); ++i)
 		proto_tensor->add_dimensions(tensor.GetDimensions()[i]);
 
-	proto_tensor->set_data(tensor.GetData(), tensor.GetSizeInBytes());
+	size_t num_bytes = tensor.GetSizeInBytes();
+
+	if (frames && num_bytes >= TENSOR_INLINE_THRESHOLD)
+	{
+		// Send the data as a separate frame. This copies the data once into the
+		// message, which ZeroMQ will send asynchronously.
+		proto_tensor->set_frame_index(frames->size());
+		frames->emplace_back(tensor.GetData(), num_bytes);
+	}
+	else
+	{
+		proto_tensor->set_data(tensor.GetData(), num_bytes);
+	}
 }
 
-void FromProto(const catkit_proto::Tensor *proto_tensor, Tensor &tensor)
+void FromProto(const catkit_proto::Tensor *proto_tensor, Tensor &tensor, MessageFrames *frames)
 {
 	auto dtype = GetDataTypeFromString(proto_tensor->dtype());
 	auto num_dimensions = proto_tensor->dimensions_size();
@@ -263,5 +289,35 @@ void FromProto(const catkit_proto::Tensor *proto_tensor, Tensor &tensor)
 	for (size_t i = num_dimensions; i < 4; ++i)
 		dimensions[i] = 1;
 
-	tensor.Set(dtype, num_dimensions, dimensions, proto_tensor->data().c_str());
+	if (proto_tensor->storage_case() != catkit_proto::Tensor::kFrameIndex)
+	{
+		tensor.Set(dtype, num_dimensions, dimensions, proto_tensor->data().c_str());
+		return;
+	}
+
+	size_t frame_index = proto_tensor->frame_index();
+
+	if (!frames || frame_index >= frames->size())
+		throw std::runtime_error("The tensor refers to a nonexistent message frame.");
+
+	auto &frame = (*frames)[frame_index];
+	size_t alignment = GetSizeOfDataType(dtype);
+
+	size_t num_bytes = alignment;
+	for (size_t i = 0; i < 4; ++i)
+		num_bytes *= dimensions[i];
+
+	if (frame.size() != num_bytes)
+		throw std::runtime_error("The message frame does not have the size of the tensor.");
+
+	if (alignment > 0 && reinterpret_cast<std::uintptr_t>(frame.data()) % alignment != 0)
+	{
+		// The data is misaligned for this data type, so we cannot use it in-place.
+		tensor.Set(dtype, num_dimensions, dimensions, (const char *) frame.data());
+		return;
+	}
+
+	// Take ownership of the message frame, so that the tensor can use its data without a copy.
+	auto message = std::make_shared<zmq::message_t>(std::move(frame));
+	tensor.Set(dtype, num_dimensions, dimensions, message->data<char>(), message);
 }
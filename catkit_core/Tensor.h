@@ -2,6 +2,7 @@
 #define TENSOR_H
 
 #include "ComplexTraits.h"
+#include "MessageFrames.h"
 #include "proto/core.pb.h"
 
 #include <Eigen/Dense>
@@ -64,6 +65,7 @@ public:
 
 	void Set(DataType data_type, size_t num_dimensions, size_t *dimensions, char *data, bool copy=true);
 	void Set(DataType data_type, size_t num_dimensions, size_t *dimensions, const char *data);
+	void Set(DataType data_type, size_t num_dimensions, size_t *dimensions, char *data, std::shared_ptr<void> buffer);
 
 	// Accessors for Eigen mapped arrays.
 	template<typename EigenType>
@@ -89,12 +91,18 @@ public:
 	char *m_Data;
 	bool m_IsOwner;
 
+	// Keeps alive an external buffer that m_Data points into.
+	std::shared_ptr<void> m_Buffer;
+
 private:
 	void SetCommon(DataType data_type, size_t num_dimensions, size_t *dimensions);
 };
 
-void ToProto(const Tensor &tensor, catkit_proto::Tensor *proto_tensor);
-void FromProto(const catkit_proto::Tensor *proto_tensor, Tensor &tensor);
+// Tensors larger than this are sent as separate message frames, if frames are given.
+const size_t TENSOR_INLINE_THRESHOLD = 16384;  // bytes.
+
+void ToProto(const Tensor &tensor, catkit_proto::Tensor *proto_tensor, MessageFrames *frames=nullptr);
+void FromProto(const catkit_proto::Tensor *proto_tensor, Tensor &tensor, MessageFrames *frames=nullptr);
 
 #include "Tensor.inl"
 
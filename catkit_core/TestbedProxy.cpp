@@ -6,6 +6,8 @@
 
 #include <memory>
 #include <regex>
+#include <map>
+#include <mutex>
 
 using namespace std;
 using namespace zmq;
@@ -14,6 +16,11 @@ using namespace std::string_literals;
 
 const double HEARTBEAT_LIVENESS = 30;
 
+// Parsed (parts of) configs, keyed by config hash and path. The config of a testbed
+// does not change during its lifetime, so this is shared by all TestbedProxy objects.
+static std::mutex config_cache_mutex;
+static std::map<std::pair<std::string, std::string>, json> config_cache;
+
 TestbedProxy::TestbedProxy(std::string host, int port)
 	: Client(host, port), m_Host(host), m_Port(port), m_HasGottenInfo(false)
 {
@@ -57,8 +64,23 @@ void TestbedProxy::StartService(const std::string &service_id)
 
 void TestbedProxy::StartServices(std::vector<std::string> service_ids)
 {
+	// Send all services in a single request, so that the testbed can start
+	// independent services concurrently.
+	catkit_proto::testbed::StartServicesRequest request;
+
 	for (const std::string &service_id : service_ids)
-		StartService(service_id);
+		request.add_service_ids(service_id);
+
+	catkit_proto::testbed::StartServicesReply reply;
+
+	try
+	{
+		reply.ParseFromString(MakeRequest("start_services", Serialize(request)));
+	}
+	catch (...)
+	{
+		throw std::runtime_error("Unable to start services.");
+	}
 }
 
 void TestbedProxy::StopService(const std::string &service_id)
@@ -135,13 +157,21 @@ ServiceReference TestbedProxy::GetServiceInfo(const std::string &service_id)
 	res.state_stream_id = reply.service().state_stream_id();
 	res.host = reply.service().host();
 	res.port = reply.service().port();
+	res.resources_stream_id = reply.service().resources_stream_id();
 
 	return res;
 }
 
-std::string TestbedProxy::RegisterService(std::string service_id, std::string service_type, std::string host, int port, int process_id, std::string heartbeat_stream_id)
+std::shared_ptr<DataStream> TestbedProxy::GetResourceStream(const std::string &service_id)
+{
+	auto info = GetServiceInfo(service_id);
+
+	return DataStream::Open(info.resources_stream_id);
+}
+
+ServiceRegistration TestbedProxy::RegisterAndConfigure(std::string service_id, std::string service_type, std::string host, int port, int process_id, std::string heartbeat_stream_id)
 {
-	catkit_proto::testbed::RegisterServiceRequest request;
+	catkit_proto::testbed::RegisterAndConfigureRequest request;
 
 	request.set_service_id(service_id);
 	request.set_service_type(service_type);
@@ -150,18 +180,27 @@ std::string TestbedProxy::RegisterService(std::string service_id, std::string se
 	request.set_process_id(process_id);
 	request.set_heartbeat_stream_id(heartbeat_stream_id);
 
-	catkit_proto::testbed::RegisterServiceReply reply;
+	catkit_proto::testbed::RegisterAndConfigureReply reply;
 
 	try
 	{
-		reply.ParseFromString(MakeRequest("register_service", Serialize(request)));
+		reply.ParseFromString(MakeRequest("register_and_configure", Serialize(request)));
 	}
 	catch (...)
 	{
 		throw std::runtime_error("Service could not be registered.");
 	}
 
-	return reply.state_stream_id();
+	ServiceRegistration registration;
+
+	registration.state_stream_id = reply.state_stream_id();
+	registration.config = json::parse(reply.config());
+	registration.logging_ingress_port = reply.logging_ingress_port();
+	registration.data_logging_ingress_port = reply.data_logging_ingress_port();
+	registration.tracing_ingress_port = reply.tracing_ingress_port();
+	registration.previous_process_ids.assign(reply.previous_process_ids().begin(), reply.previous_process_ids().end());
+
+	return registration;
 }
 
 bool TestbedProxy::IsSimulated()
@@ -204,10 +243,46 @@ std::shared_ptr<DataStream> TestbedProxy::GetHeartbeat()
 }
 
 json TestbedProxy::GetConfig()
+{
+	return GetConfig("");
+}
+
+json TestbedProxy::GetConfig(const std::string &path)
+{
+	GetTestbedInfo();
+
+	{
+		std::scoped_lock<std::mutex> lock(config_cache_mutex);
+
+		// If we have the full config, we can get any part from that.
+		auto full_config = config_cache.find({m_ConfigHash, ""});
+		if (full_config != config_cache.end())
+			return full_config->second.at(json::json_pointer(path));
+
+		auto config = config_cache.find({m_ConfigHash, path});
+		if (config != config_cache.end())
+			return config->second;
+	}
+
+	catkit_proto::testbed::GetConfigRequest request;
+	request.set_path(path);
+
+	catkit_proto::testbed::GetConfigReply reply;
+	reply.ParseFromString(MakeRequest("get_config", Serialize(request)));
+
+	json config = json::parse(reply.config());
+
+	std::scoped_lock<std::mutex> lock(config_cache_mutex);
+	config_cache[{reply.config_hash(), path}] = config;
+
+	return config;
+}
+
+std::string TestbedProxy::GetConfigHash()
 {
 	GetTestbedInfo();
 
-	return m_Config;
+	return m_ConfigHash;
 }
 
 std::string TestbedProxy::GetHost()
@@ -266,7 +341,7 @@ std::string TestbedProxy::GetMode()
 {
     GetTestbedInfo();
 
-    return m_Config["testbed"]["mode"];
+    return GetConfig("/testbed/mode");
 }
 
 std::vector<std::string> TestbedProxy::GetActiveServices()
@@ -291,7 +366,7 @@ std::string TestbedProxy::GetBaseDataPath()
 
 	// No environment variable was defined.
 	// Let's use the config file instead.
-	auto conf = m_Config["testbed"]["base_data_path"];
+	auto conf = GetConfig("/testbed/base_data_path");
 
 	if (conf.contains("by_hostname"))
 	{
@@ -320,7 +395,7 @@ std::string TestbedProxy::GetSupportDataPath()
 
 	// No environment variable was defined.
 	// Let's use the config file instead.
-	auto conf = m_Config["testbed"]["support_data_path"];
+	auto conf = GetConfig("/testbed/support_data_path");
 
 	if (conf.contains("by_hostname"))
 	{
@@ -341,7 +416,7 @@ std::string TestbedProxy::GetLongTermMonitoringPath()
 {
 	GetTestbedInfo();
 
-	std::string long_term_monitoring_path = m_Config["testbed"]["long_term_monitoring_path"];
+	std::string long_term_monitoring_path = GetConfig("/testbed/long_term_monitoring_path");
 	std::string simulator_or_hardware = m_IsSimulated ? "simulator" : "hardware";
 
 	// Replace template variables.
@@ -368,7 +443,7 @@ void TestbedProxy::GetTestbedInfo()
 	catkit_proto::testbed::GetInfoReply reply;
 	reply.ParseFromString(MakeRequest("get_info", Serialize(request)));
 
-	m_Config = json::parse(reply.config());
+	m_ConfigHash = reply.config_hash();
 	m_IsSimulated = reply.is_simulated();
 
 	m_HeartbeatStream = DataStream::Open(reply.heartbeat_stream_id());
@@ -22,6 +22,19 @@ struct ServiceReference
 	std::string state_stream_id;
 	std::string host;
 	unsigned long port;
+	std::string resources_stream_id;
+};
+
+struct ServiceRegistration
+{
+	std::string state_stream_id;
+	nlohmann::json config;
+	int logging_ingress_port;
+	int data_logging_ingress_port;
+	int tracing_ingress_port;
+
+	// Processes of this service that crashed since it was last started cleanly, most recent first.
+	std::vector<int> previous_process_ids;
 };
 
 class TestbedProxy : public Client, public std::enable_shared_from_this<TestbedProxy>
@@ -40,8 +53,9 @@ public:
 	void TerminateService(const std::string &service_id);
 
 	ServiceReference GetServiceInfo(const std::string &service_id);
+	std::shared_ptr<DataStream> GetResourceStream(const std::string &service_id);
 
-	std::string RegisterService(std::string service_id, std::string service_type, std::string host, int port, int process_id, std::string heartbeat_stream_id);
+	ServiceRegistration RegisterAndConfigure(std::string service_id, std::string service_type, std::string host, int port, int process_id, std::string heartbeat_stream_id);
 
 	bool IsSimulated();
 	bool IsAlive();
@@ -51,6 +65,8 @@ public:
 	std::shared_ptr<DataStream> GetHeartbeat();
 
 	nlohmann::json GetConfig();
+	nlohmann::json GetConfig(const std::string &path);
+	std::string GetConfigHash();
 
 	std::string GetHost();
 	int GetPort();
@@ -93,7 +109,7 @@ private:
 	std::shared_ptr<DataStream> m_HeartbeatStream;
 
 	bool m_IsSimulated;
-	nlohmann::json m_Config;
+	std::string m_ConfigHash;
 
 	std::map<std::string, std::shared_ptr<ServiceProxy>> m_Services;
 };
@@ -3,6 +3,7 @@
 #include "Timing.h"
 #include "Util.h"
 #include "Log.h"
+#include "Registry.h"
 #include "proto/tracing.pb.h"
 
 #include <zmq.hpp>
@@ -161,8 +162,7 @@ struct BuildProtoEvent
 
 void TracingProxy::MessageLoop()
 {
-	zmq::context_t context;
-	zmq::socket_t socket(context, ZMQ_PUSH);
+	zmq::socket_t socket(GetZmqContext(), ZMQ_PUSH);
 
 	socket.set(zmq::sockopt::linger, 0);
 	socket.set(zmq::sockopt::sndtimeo, 10);
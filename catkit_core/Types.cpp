@@ -1,6 +1,6 @@
 #include "Types.h"
 
-void ToProto(const Value &value, catkit_proto::Value *proto_value)
+void ToProto(const Value &value, catkit_proto::Value *proto_value, MessageFrames *frames)
 {
 	if (std::holds_alternative<NoneValue>(value))
 	{
@@ -24,15 +24,15 @@ void ToProto(const Value &value, catkit_proto::Value *proto_value)
 	}
 	else if (std::holds_alternative<Dict>(value))
 	{
-		ToProto(std::get<Dict>(value), proto_value->mutable_dict_value());
+		ToProto(std::get<Dict>(value), proto_value->mutable_dict_value(), frames);
 	}
 	else if (std::holds_alternative<List>(value))
 	{
-		ToProto(std::get<List>(value), proto_value->mutable_list_value());
+		ToProto(std::get<List>(value), proto_value->mutable_list_value(), frames);
 	}
 	else if (std::holds_alternative<Tensor>(value))
 	{
-		ToProto(std::get<Tensor>(value), proto_value->mutable_tensor_value());
+		ToProto(std::get<Tensor>(value), proto_value->mutable_tensor_value(), frames);
 	}
 	else
 	{
@@ -40,18 +40,18 @@ void ToProto(const Value &value, catkit_proto::Value *proto_value)
 	}
 }
 
-void ToProto(const List &list, catkit_proto::List *proto_list)
+void ToProto(const List &list, catkit_proto::List *proto_list, MessageFrames *frames)
 {
 	proto_list->clear_items();
 
 	for (auto &i : list)
 	{
 		auto item = proto_list->add_items();
-		ToProto(i, item);
+		ToProto(i, item, frames);
 	}
 }
 
-void ToProto(const Dict &dict, catkit_proto::Dict *proto_dict)
+void ToProto(const Dict &dict, catkit_proto::Dict *proto_dict, MessageFrames *frames)
 {
 	proto_dict->clear_items();
 	auto d = proto_dict->mutable_items();
@@ -59,11 +59,11 @@ void ToProto(const Dict &dict, catkit_proto::Dict *proto_dict)
 	for (auto& [key, value] : dict)
 	{
 		auto &v = (*d)[key];
-		ToProto(value, &v);
+		ToProto(value, &v, frames);
 	}
 }
 
-void FromProto(const catkit_proto::Value *proto_value, Value &value)
+void FromProto(const catkit_proto::Value *proto_value, Value &value, MessageFrames *frames)
 {
 	if (proto_value->has_none_value())
 	{
@@ -88,19 +88,19 @@ void FromProto(const catkit_proto::Value *proto_value, Value &value)
 	else if (proto_value->has_dict_value())
 	{
 		Dict dict;
-		FromProto(&proto_value->dict_value(), dict);
+		FromProto(&proto_value->dict_value(), dict, frames);
 		value = Value(std::move(dict));
 	}
 	else if (proto_value->has_list_value())
 	{
 		List list;
-		FromProto(&proto_value->list_value(), list);
+		FromProto(&proto_value->list_value(), list, frames);
 		value = Value(std::move(list));
 	}
 	else if (proto_value->has_tensor_value())
 	{
 		Tensor tensor;
-		FromProto(&proto_value->tensor_value(), tensor);
+		FromProto(&proto_value->tensor_value(), tensor, frames);
 		value = Value(std::move(tensor));
 	}
 	else
@@ -109,26 +109,26 @@ void FromProto(const catkit_proto::Value *proto_value, Value &value)
 	}
 }
 
-void FromProto(const catkit_proto::List *proto_list, List &list)
+void FromProto(const catkit_proto::List *proto_list, List &list, MessageFrames *frames)
 {
 	list.clear();
 
 	for (auto &item : proto_list->items())
 	{
 		Value val;
-		FromProto(&item, val);
+		FromProto(&item, val, frames);
 		list.push_back(std::move(val));
 	}
 }
 
-void FromProto(const catkit_proto::Dict *proto_dict, Dict &dict)
+void FromProto(const catkit_proto::Dict *proto_dict, Dict &dict, MessageFrames *frames)
 {
 	dict.clear();
 
 	for (auto & [key, value] : proto_dict->items())
 	{
 		Value val;
-		FromProto(&value, val);
+		FromProto(&value, val, frames);
 		dict.insert(std::make_pair(key, std::move(val)));
 	}
 }
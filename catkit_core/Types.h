@@ -35,13 +35,13 @@ class Dict : public std::map<std::string, Value>
 {
 };
 
-void ToProto(const Value &value, catkit_proto::Value *proto_value);
-void ToProto(const List &list, catkit_proto::List *proto_list);
-void ToProto(const Dict &dict, catkit_proto::Dict *proto_dict);
+void ToProto(const Value &value, catkit_proto::Value *proto_value, MessageFrames *frames=nullptr);
+void ToProto(const List &list, catkit_proto::List *proto_list, MessageFrames *frames=nullptr);
+void ToProto(const Dict &dict, catkit_proto::Dict *proto_dict, MessageFrames *frames=nullptr);
 
-void FromProto(const catkit_proto::Value *proto_value, Value &value);
-void FromProto(const catkit_proto::List *proto_list, List &list);
-void FromProto(const catkit_proto::Dict *proto_dict, Dict &dict);
+void FromProto(const catkit_proto::Value *proto_value, Value &value, MessageFrames *frames=nullptr);
+void FromProto(const catkit_proto::List *proto_list, List &list, MessageFrames *frames=nullptr);
+void FromProto(const catkit_proto::Dict *proto_dict, Dict &dict, MessageFrames *frames=nullptr);
 
 template <typename T>
 T CastTo(const Value &val)
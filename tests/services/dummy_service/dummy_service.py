@@ -1,5 +1,8 @@
 from catkit2 import Service
 
+import os
+import threading
+
 import numpy as np
 
 N = 16
@@ -23,6 +26,7 @@ class DummyService(Service):
 
         self.make_command('add', self.add)
         self.make_command('push_on_stream', self.push_on_stream)
+        self.make_command('crash', self.crash)
 
         self.stream = self.make_data_stream('stream', 'float64', [N, N], 20)
         self.push_on_stream()
@@ -59,6 +63,10 @@ class DummyService(Service):
         arr = np.random.randn(N, N).astype('float64')
         self.stream.submit_data(arr)
 
+    def crash(self):
+        # Exit without closing down, after the reply to this command was sent.
+        threading.Timer(0.1, os._exit, args=(1,)).start()
+
 if __name__ == '__main__':
     service = DummyService()
     service.run()
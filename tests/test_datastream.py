@@ -60,3 +60,24 @@ def test_data_stream(shape, dtype):
 
         with pytest.raises(RuntimeError):
             created_stream.submit_data(data)
+
+def test_data_stream_open_multiple():
+    created_stream = DataStream.create('multiple_open_stream', 'service', 'float64', [10], 20)
+
+    # Streams opened multiple times share their mapping, but should still read independently.
+    stream_a = DataStream.open(created_stream.stream_id)
+    stream_b = DataStream.open(created_stream.stream_id)
+
+    data = np.random.randn(10)
+    created_stream.submit_data(data)
+
+    assert np.allclose(stream_a.get_next_frame(1000).data, data)
+    assert np.allclose(stream_b.get_next_frame(1000).data, data)
+
+    # Closing one of the streams should not affect the other.
+    del stream_a
+
+    data = np.random.randn(10)
+    created_stream.submit_data(data)
+
+    assert np.allclose(stream_b.get_next_frame(1000).data, data)
@@ -0,0 +1,40 @@
+import subprocess
+import sys
+
+import pytest
+
+def get_imported_modules(statement):
+    # Each line of the -X importtime output ends with the name of an imported module.
+    output = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement], capture_output=True, text=True, check=True)
+
+    modules = set()
+    for line in output.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            modules.add(line.rsplit('|', 1)[1].strip())
+
+    return modules
+
+@pytest.mark.parametrize('statement', [
+    'import catkit2',
+    'from catkit2.testbed.service import Service',
+    'from catkit2 import TestbedProxy',
+])
+def test_import_is_lightweight(statement):
+    modules = get_imported_modules(statement)
+
+    assert 'catkit2' in modules
+
+    for heavy_module in ['hcipy', 'astropy', 'asdf', 'catkit2.simulator.simulator', 'catkit2.testbed.proxies.bmc_dm']:
+        assert heavy_module not in modules
+
+def test_import_proxy_on_first_use():
+    # Modules imported through importlib do not show up in the -X importtime output.
+    statement = '; '.join([
+        'import sys',
+        'import catkit2',
+        'catkit2.ServiceProxy.get_service_interface("camera")',
+        'print("catkit2.testbed.proxies.camera" in sys.modules, "catkit2.testbed.proxies.bmc_dm" in sys.modules)'
+    ])
+    output = subprocess.run([sys.executable, '-c', statement], capture_output=True, text=True, check=True)
+
+    assert output.stdout.split() == ['True', 'False']
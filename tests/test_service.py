@@ -1,4 +1,6 @@
 import pytest
+import numpy as np
+import tracemalloc
 
 def test_service_property(dummy_service):
     # We should be able to read and write to a property.
@@ -43,6 +45,32 @@ def test_service_command(dummy_service):
 
     assert dummy_service.add(a=a, b=b) == a + b
 
+@pytest.mark.parametrize('shape', [(4, 4), (256, 256)])
+def test_service_command_array(dummy_service, shape):
+    # Both small (inlined) and large (out-of-band) arrays should arrive intact.
+    a = np.random.randn(*shape)
+    b = np.random.randn(*shape)
+
+    assert np.allclose(dummy_service.add(a=a, b=b), a + b)
+
+def test_service_command_array_allocations(dummy_service):
+    a = np.random.randn(512, 512)
+    b = np.random.randn(512, 512)
+
+    # Warm up, so that one-time allocations are not counted.
+    dummy_service.add(a=a, b=b)
+
+    tracemalloc.start()
+    try:
+        res = dummy_service.add(a=a, b=b)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # The result should be handed to Numpy without making a copy.
+    assert not res.flags.owndata
+    assert peak < res.nbytes
+
 def test_service_datastream(dummy_service):
     assert dummy_service.stream.dtype == 'float64'
 
@@ -0,0 +1,166 @@
+import pytest
+import json
+import subprocess
+import sys
+import threading
+import time
+
+import catkit2
+from catkit2.testbed.monitoring import ProcessWatcher, Watchdog, wait_for_process_exit
+from catkit2.testbed.forkserver import ForkServer
+from catkit2.catkit_bindings import ServiceState
+
+def test_testbed_config(testbed):
+    config = testbed.config
+
+    # Parts of the config should be identical to the full config.
+    assert testbed.get_config('/services/dummy_service') == config['services']['dummy_service']
+    assert testbed.get_config('/testbed/default_port') == config['testbed']['default_port']
+
+    # Another proxy to the same testbed should see the same config.
+    other_testbed = catkit2.TestbedProxy('127.0.0.1', testbed.port)
+    assert other_testbed.config_hash == testbed.config_hash
+
+def test_testbed_config_nonexistent(testbed):
+    with pytest.raises(RuntimeError):
+        testbed.get_config('/services/nonexistent_service')
+
+def test_testbed_start_services(testbed):
+    testbed.start_services(['dependent_service'])
+
+    service = testbed.get_service('dependent_service')
+    service.start(60)
+
+    # The dependency must have been started before the service itself.
+    assert testbed.get_service('dummy_service').is_running
+    assert service.readonly_property == 6
+
+    service.stop()
+
+def test_testbed_restart_crashed_service(testbed):
+    service = testbed.get_service('restarting_service')
+    service.start(60)
+
+    stream_id = service.stream.stream_id
+
+    service.crash()
+
+    # Wait for the testbed to notice the crash and restart the service.
+    seen_crash = False
+    start = time.time()
+
+    while time.time() - start < 60:
+        state = service.state
+
+        if state == ServiceState.CRASHED:
+            seen_crash = True
+        elif seen_crash and state == ServiceState.RUNNING:
+            break
+
+        time.sleep(0.01)
+
+    assert seen_crash
+    assert service.state == ServiceState.RUNNING
+
+    # The restarted service should have reused the data stream of the crashed one.
+    assert service.stream.stream_id == stream_id
+
+    service.stop()
+
+def test_testbed_resource_usage(testbed, dummy_service):
+    start = time.time()
+
+    # Wait for the first sample.
+    while time.time() - start < 30:
+        usage = testbed.get_resource_usage('dummy_service')
+
+        if usage['memory_rss'] == usage['memory_rss']:
+            break
+
+        time.sleep(0.1)
+
+    assert usage['memory_rss'] > 0
+    assert usage['num_threads'] >= 1
+    assert usage['num_fds'] >= 1
+    assert usage['cpu_percent'] >= 0
+
+    if sys.platform == 'linux':
+        # The dummy service owns multiple data streams.
+        assert usage['shared_memory_bytes'] > 0
+
+    stream = testbed.get_resource_stream('dummy_service')
+    assert stream.get().shape == (5,)
+
+def test_wait_for_process_exit():
+    process = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(0.5)'])
+
+    assert not wait_for_process_exit(process.pid, 0.01)
+    assert wait_for_process_exit(process.pid, 30)
+
+    process.wait()
+
+def test_process_watcher():
+    exited = threading.Event()
+
+    watcher = ProcessWatcher(lambda process: exited.set())
+    watcher.start()
+
+    try:
+        process = subprocess.Popen([sys.executable, '-c', 'pass'])
+        watcher.watch(process)
+
+        assert exited.wait(30)
+        assert process.returncode == 0
+    finally:
+        watcher.stop()
+
+def test_watchdog():
+    calls = []
+    done = threading.Event()
+
+    def check(key):
+        calls.append(key)
+
+        if len(calls) == 3:
+            done.set()
+            return None
+
+        return 0.01
+
+    watchdog = Watchdog()
+    watchdog.start()
+
+    try:
+        watchdog.schedule('a', 0.01, check)
+        watchdog.schedule('b', 10, check)
+        watchdog.cancel('b')
+
+        assert done.wait(10)
+        assert calls == ['a', 'a', 'a']
+    finally:
+        watchdog.stop()
+
+@pytest.mark.skipif(not ForkServer.is_supported(), reason='Fork servers are not supported on this platform.')
+def test_fork_server(tmp_path):
+    script = tmp_path / 'script.py'
+    script.write_text(
+        'import os, sys, json\n'
+        'with open("result.json", "w") as f:\n'
+        '    json.dump({"argv": sys.argv[1:], "env": os.environ.get("FORK_TEST"), "affinity": sorted(os.sched_getaffinity(0))}, f)\n'
+    )
+
+    fork_server = ForkServer()
+    fork_server.start()
+
+    try:
+        process = fork_server.launch(str(script), ['--id', 'test'], str(tmp_path), {'FORK_TEST': 'value'}, [0])
+        process.wait(30)
+    finally:
+        fork_server.stop()
+
+    with open(tmp_path / 'result.json') as f:
+        result = json.load(f)
+
+    assert result['argv'] == ['--id', 'test']
+    assert result['env'] == 'value'
+    assert result['affinity'] == [0]